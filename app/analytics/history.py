@@ -0,0 +1,133 @@
+"""
+One symbol's EOD history as parallel columns. Both queries are range scans on
+covering (symbol_id, trade_date, ...) indexes; screener hits are folded into one
+integer per day with a bit per screener, so years of data stay a few small arrays.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from app.models.daily_screener_status import DailyScreenerStatus
+from app.models.daily_symbol_snapshot import DailySymbolSnapshot
+from app.models.screener import Screener
+
+# Masks are sent as JSON numbers; clients parsing them as doubles (JavaScript)
+# lose bits above 2**53.
+MAX_MASK_BITS = 53
+
+
+@dataclass
+class SymbolHistory:
+    dates: List[date] = field(default_factory=list)
+    closes: List[Optional[float]] = field(default_factory=list)
+    change_pct: List[Optional[float]] = field(default_factory=list)
+    volume: List[Optional[int]] = field(default_factory=list)
+    screener_mask: List[int] = field(default_factory=list)
+    # (screener_id, name) in bit order: bit i of a mask is screeners[i]
+    screeners: List[Tuple[int, str]] = field(default_factory=list)
+    # More than MAX_MASK_BITS screeners fired; only the most frequent have a bit
+    screeners_truncated: bool = False
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+def load_history(session: Session, symbol_id: int, start: date, end: date) -> SymbolHistory:
+    snapshots = {
+        trade_date: (close, change, volume)
+        for trade_date, close, change, volume in session.exec(
+            select(
+                DailySymbolSnapshot.trade_date,
+                DailySymbolSnapshot.close_price,
+                DailySymbolSnapshot.change_pct,
+                DailySymbolSnapshot.volume,
+            )
+            .where(
+                DailySymbolSnapshot.symbol_id == symbol_id,
+                DailySymbolSnapshot.trade_date >= start,
+                DailySymbolSnapshot.trade_date <= end,
+            )
+            .order_by(DailySymbolSnapshot.trade_date)
+        )
+    }
+
+    hits = session.exec(
+        select(DailyScreenerStatus.trade_date, DailyScreenerStatus.screener_id).where(
+            DailyScreenerStatus.symbol_id == symbol_id,
+            DailyScreenerStatus.trade_date >= start,
+            DailyScreenerStatus.trade_date <= end,
+        )
+    ).all()
+
+    hit_days = Counter(screener_id for _, screener_id in hits)
+    truncated = len(hit_days) > MAX_MASK_BITS
+    screener_ids = sorted(sid for sid, _ in hit_days.most_common(MAX_MASK_BITS))
+    bit = {screener_id: i for i, screener_id in enumerate(screener_ids)}
+
+    masks: Dict[date, int] = defaultdict(int)
+    for trade_date, screener_id in hits:
+        masks[trade_date] |= 1 << bit[screener_id] if screener_id in bit else 0
+
+    names: Dict[int, str] = {}
+    if screener_ids:
+        names = {
+            sid: name
+            for sid, name in session.exec(
+                select(Screener.id, Screener.name).where(Screener.id.in_(screener_ids))
+            )
+        }
+
+    history = SymbolHistory(
+        screeners=[(sid, names.get(sid, "")) for sid in screener_ids],
+        screeners_truncated=truncated,
+    )
+
+    # Days with hits but no snapshot (yet) still show up, with null prices
+    for trade_date in sorted(snapshots.keys() | masks.keys()):
+        close, change, volume = snapshots.get(trade_date, (None, None, None))
+        history.dates.append(trade_date)
+        history.closes.append(close)
+        history.change_pct.append(change)
+        history.volume.append(volume)
+        history.screener_mask.append(masks.get(trade_date, 0))
+
+    return history
+
+
+def downsample(history: SymbolHistory, points: int) -> SymbolHistory:
+    """
+    At most `points` consecutive buckets. Each bucket carries its last date and
+    close, the compounded change over the bucket, total volume and the OR of
+    its screener masks, so no move or hit inside a bucket is lost.
+    """
+    n = len(history)
+    if n <= points:
+        return history
+
+    out = SymbolHistory(screeners=history.screeners, screeners_truncated=history.screeners_truncated)
+    for b in range(points):
+        lo, hi = b * n // points, (b + 1) * n // points
+
+        closes = [c for c in history.closes[lo:hi] if c is not None]
+        changes = [c for c in history.change_pct[lo:hi] if c is not None]
+        volumes = [v for v in history.volume[lo:hi] if v is not None]
+
+        growth = 1.0
+        for change in changes:
+            growth *= 1 + change / 100
+
+        mask = 0
+        for m in history.screener_mask[lo:hi]:
+            mask |= m
+
+        out.dates.append(history.dates[hi - 1])
+        out.closes.append(closes[-1] if closes else None)
+        out.change_pct.append(round((growth - 1) * 100, 4) if changes else None)
+        out.volume.append(sum(volumes) if volumes else None)
+        out.screener_mask.append(mask)
+
+    return out
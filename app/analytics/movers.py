@@ -0,0 +1,122 @@
+"""
+Top-N movers over a cached, columnar copy of one (index, trade_date) snapshot.
+The first request loads the day's snapshots for the index once; every poll after
+that is a heap selection over plain tuples, O(n log k) with no DB access, and the
+response size depends only on `limit`.
+"""
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from app.core import cache
+from app.db.engine import engine
+from app.models.daily_symbol_snapshot import DailySymbolSnapshot
+from app.models.index import Index
+from app.models.index_constituent import IndexConstituent
+from app.models.symbol import Symbol
+
+METRICS = ("change_pct", "volume", "delivery_pct")
+
+CACHE_SIZE = 64
+# Safety net for writes made by other processes (e.g. a manual ingestion run)
+CACHE_TTL_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class ColumnarSnapshot:
+    symbols: Tuple[str, ...]
+    close: Tuple[Optional[float], ...]
+    change_pct: Tuple[Optional[float], ...]
+    volume: Tuple[Optional[int], ...]
+    delivery_pct: Tuple[Optional[float], ...]
+    loaded_at: float
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def row(self, i: int) -> dict:
+        return {
+            "symbol": self.symbols[i],
+            "close": self.close[i],
+            "change_pct": self.change_pct[i],
+            "volume": self.volume[i],
+            "delivery_pct": self.delivery_pct[i],
+        }
+
+    def top(self, metric: str, limit: int, *, descending: bool = True) -> List[dict]:
+        column = getattr(self, metric)
+        candidates = ((v, i) for i, v in enumerate(column) if v is not None)
+        select_top = heapq.nlargest if descending else heapq.nsmallest
+        return [self.row(i) for _, i in select_top(limit, candidates)]
+
+
+def load_snapshot(session: Session, index_name: str, trade_date: date) -> ColumnarSnapshot | None:
+    idx = session.exec(select(Index).where(Index.name == index_name)).first()
+    if not idx:
+        return None
+
+    rows = session.exec(
+        select(Symbol.symbol, DailySymbolSnapshot)
+        .where(IndexConstituent.index_id == idx.id)
+        .where(Symbol.id == IndexConstituent.symbol_id)
+        .where(DailySymbolSnapshot.symbol_id == IndexConstituent.symbol_id)
+        .where(DailySymbolSnapshot.trade_date == trade_date)
+    ).all()
+
+    return ColumnarSnapshot(
+        symbols=tuple(sym for sym, _ in rows),
+        close=tuple(snap.close_price for _, snap in rows),
+        change_pct=tuple(snap.change_pct for _, snap in rows),
+        volume=tuple(snap.volume for _, snap in rows),
+        delivery_pct=tuple((snap.extra_data or {}).get("delivery_pct") for _, snap in rows),
+        loaded_at=time.monotonic(),
+    )
+
+
+class SnapshotCache:
+    """Small LRU of ColumnarSnapshots, cleared on snapshot/index writes."""
+
+    def __init__(self, size: int = CACHE_SIZE, ttl: float = CACHE_TTL_SECONDS):
+        self.size = size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, date], ColumnarSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, index_name: str, trade_date: date) -> ColumnarSnapshot | None:
+        key = (index_name, trade_date)
+        with self._lock:
+            if key in self._entries:
+                snap = self._entries[key]
+                if time.monotonic() - snap.loaded_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    return snap
+
+        with Session(engine) as session:
+            snap = load_snapshot(session, index_name, trade_date)
+
+        # Unknown index / empty day is not cached, so it shows up once loaded
+        if snap is None or not len(snap):
+            return snap
+
+        with self._lock:
+            self._entries[key] = snap
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return snap
+
+
+snapshot_cache = SnapshotCache()
+cache.on_invalidate(cache.SNAPSHOTS, snapshot_cache.clear)
+cache.on_invalidate(cache.INDICES, snapshot_cache.clear)
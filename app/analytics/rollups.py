@@ -0,0 +1,197 @@
+"""
+Screener hit-frequency rollups. A date range is answered by stitching together whole
+months and whole weeks from ScreenerHitRollup plus at most a few edge days from
+DailyScreenerStatus, instead of scanning every status row in the range.
+"""
+
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Literal, Tuple
+
+from sqlalchemy import delete, func, insert, literal
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.models.daily_screener_status import DailyScreenerStatus
+from app.models.screener_hit_rollup import ScreenerHitRollup
+
+WEEK = "week"
+MONTH = "month"
+
+GroupBy = Literal["screener", "symbol", "pair"]
+
+
+def week_start(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def month_end(d: date) -> date:
+    return d.replace(day=monthrange(d.year, d.month)[1])
+
+
+def bump(
+    session: Session,
+    *,
+    screener_id: int,
+    symbol_id: int,
+    trade_date: date,
+    new_day: bool,
+) -> None:
+    """
+    Count one trigger in the week and month rollups.
+
+    `new_day` is True when this trigger created the day's DailyScreenerStatus,
+    i.e. it is the first hit for (screener, symbol) that day.
+    """
+    for grain, period in ((WEEK, week_start(trade_date)), (MONTH, month_start(trade_date))):
+        stmt = sqlite_insert(ScreenerHitRollup).values(
+            grain=grain,
+            period_start=period,
+            screener_id=screener_id,
+            symbol_id=symbol_id,
+            hit_days=int(new_day),
+            trigger_count=1,
+        )
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["grain", "period_start", "screener_id", "symbol_id"],
+                set_={
+                    "hit_days": ScreenerHitRollup.hit_days + stmt.excluded.hit_days,
+                    "trigger_count": ScreenerHitRollup.trigger_count + 1,
+                },
+            )
+        )
+
+
+@dataclass
+class RangePlan:
+    months: List[date] = field(default_factory=list)
+    weeks: List[date] = field(default_factory=list)
+    days: List[date] = field(default_factory=list)
+
+
+def plan_range(start: date, end: date) -> RangePlan:
+    """
+    Cover [start, end] exactly with disjoint whole months, whole weeks and days.
+
+    Weeks that would spill into a month fully inside the range are broken
+    into days so that month can still be read as one rollup row.
+    """
+    plan = RangePlan()
+    cur = start
+
+    while cur <= end:
+        if cur.day == 1 and month_end(cur) <= end:
+            plan.months.append(cur)
+            cur = month_end(cur) + timedelta(days=1)
+            continue
+
+        week_last = cur + timedelta(days=6)
+        if cur.weekday() == 0 and week_last <= end:
+            next_month = month_end(cur) + timedelta(days=1)
+            spills_into_full_month = week_last >= next_month and month_end(next_month) <= end
+            if not spills_into_full_month:
+                plan.weeks.append(cur)
+                cur = week_last + timedelta(days=1)
+                continue
+
+        plan.days.append(cur)
+        cur += timedelta(days=1)
+
+    return plan
+
+
+def hit_counts(
+    session: Session,
+    start: date,
+    end: date,
+    *,
+    group_by: GroupBy = "pair",
+    screener_id: int | None = None,
+    symbol_id: int | None = None,
+) -> Dict[Tuple[int, ...], Tuple[int, int]]:
+    """
+    {key: (hit_days, trigger_count)} for the range, where key is
+    (screener_id,), (symbol_id,) or (screener_id, symbol_id) per `group_by`.
+    """
+    plan = plan_range(start, end)
+    totals: Dict[Tuple[int, ...], List[int]] = {}
+
+    def keys(model):
+        return {
+            "screener": (model.screener_id,),
+            "symbol": (model.symbol_id,),
+            "pair": (model.screener_id, model.symbol_id),
+        }[group_by]
+
+    def accumulate(rows) -> None:
+        for *key, days, triggers in rows:
+            bucket = totals.setdefault(tuple(key), [0, 0])
+            bucket[0] += days or 0
+            bucket[1] += triggers or 0
+
+    for grain, periods in ((MONTH, plan.months), (WEEK, plan.weeks)):
+        if not periods:
+            continue
+        stmt = (
+            select(*keys(ScreenerHitRollup), func.sum(ScreenerHitRollup.hit_days), func.sum(ScreenerHitRollup.trigger_count))
+            .where(ScreenerHitRollup.grain == grain)
+            .where(ScreenerHitRollup.period_start.in_(periods))
+            .group_by(*keys(ScreenerHitRollup))
+        )
+        if screener_id is not None:
+            stmt = stmt.where(ScreenerHitRollup.screener_id == screener_id)
+        if symbol_id is not None:
+            stmt = stmt.where(ScreenerHitRollup.symbol_id == symbol_id)
+        accumulate(session.exec(stmt).all())
+
+    if plan.days:
+        stmt = (
+            select(*keys(DailyScreenerStatus), func.count(), func.sum(DailyScreenerStatus.trigger_count))
+            .where(DailyScreenerStatus.trade_date.in_(plan.days))
+            .where(DailyScreenerStatus.triggered == True)
+            .group_by(*keys(DailyScreenerStatus))
+        )
+        if screener_id is not None:
+            stmt = stmt.where(DailyScreenerStatus.screener_id == screener_id)
+        if symbol_id is not None:
+            stmt = stmt.where(DailyScreenerStatus.symbol_id == symbol_id)
+        accumulate(session.exec(stmt).all())
+
+    return {key: (days, triggers) for key, (days, triggers) in totals.items()}
+
+
+def rebuild(session: Session) -> int:
+    """Recompute every rollup row from DailyScreenerStatus. Returns rows written."""
+    session.execute(delete(ScreenerHitRollup))
+
+    # SQLite date math: Monday of the week / first of the month
+    periods = {
+        WEEK: func.date(DailyScreenerStatus.trade_date, "-6 days", "weekday 1"),
+        MONTH: func.date(DailyScreenerStatus.trade_date, "start of month"),
+    }
+
+    for grain, period in periods.items():
+        session.execute(
+            insert(ScreenerHitRollup).from_select(
+                ["grain", "period_start", "screener_id", "symbol_id", "hit_days", "trigger_count"],
+                select(
+                    literal(grain),
+                    period,
+                    DailyScreenerStatus.screener_id,
+                    DailyScreenerStatus.symbol_id,
+                    func.count(),
+                    func.sum(DailyScreenerStatus.trigger_count),
+                )
+                .where(DailyScreenerStatus.triggered == True)
+                .group_by(period, DailyScreenerStatus.screener_id, DailyScreenerStatus.symbol_id),
+            )
+        )
+
+    session.commit()
+    return session.exec(select(func.count()).select_from(ScreenerHitRollup)).one()
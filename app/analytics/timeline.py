@@ -0,0 +1,286 @@
+"""
+Intraday trigger timeline: screener hits per 5-minute bucket, per index.
+
+Every alert bumps ScreenerTimelineBucket in the webhook transaction (one upsert per
+index the alert's symbols belong to, plus index 0 = all symbols). Today is served
+from an in-memory ring of 288 counters per (index, screener); past days read the
+compact table. Raw ScreenerEvent rows are only touched by `rebuild`.
+"""
+
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import date, time
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.db.engine import engine
+from app.models.index_constituent import IndexConstituent
+from app.models.screener_event import ScreenerEvent
+from app.models.screener_timeline_bucket import ScreenerTimelineBucket
+
+BUCKET_MINUTES = 5
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+ALL_SYMBOLS = 0
+
+# {(index_id, screener_id, bucket_minute): hits}
+Counts = Dict[Tuple[int, int, int], int]
+
+
+def bucket_of(t: time) -> int:
+    minute = t.hour * 60 + t.minute
+    return minute - minute % BUCKET_MINUTES
+
+
+def bump(
+    session: Session,
+    *,
+    trade_date: date,
+    screener_id: int,
+    symbol_ids: Iterable[int],
+    trigger_time: time | None,
+) -> Counts:
+    """
+    Count one alert's symbols into the timeline. Returns the increments for
+    the caller to commit through `timeline_ring.committing`.
+
+    Alerts without a trigger time cannot be placed and are skipped.
+    """
+    symbol_ids = list(symbol_ids)
+    if trigger_time is None or not symbol_ids:
+        return {}
+
+    bucket = bucket_of(trigger_time)
+
+    membership: Dict[int, List[int]] = defaultdict(list)
+    for index_id, symbol_id in session.exec(
+        select(IndexConstituent.index_id, IndexConstituent.symbol_id).where(
+            IndexConstituent.symbol_id.in_(set(symbol_ids))
+        )
+    ):
+        membership[symbol_id].append(index_id)
+
+    # One hit per listed symbol in every bucket it belongs to (duplicates
+    # included, like the ScreenerEvent rows `rebuild` counts)
+    per_index = Counter({ALL_SYMBOLS: len(symbol_ids)})
+    for symbol_id in symbol_ids:
+        per_index.update(membership.get(symbol_id, ()))
+
+    for index_id, hits in per_index.items():
+        stmt = sqlite_insert(ScreenerTimelineBucket).values(
+            trade_date=trade_date,
+            index_id=index_id,
+            screener_id=screener_id,
+            bucket_minute=bucket,
+            hits=hits,
+        )
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["trade_date", "index_id", "screener_id", "bucket_minute"],
+                set_={"hits": ScreenerTimelineBucket.hits + stmt.excluded.hits},
+            )
+        )
+
+    return {(index_id, screener_id, bucket): hits for index_id, hits in per_index.items()}
+
+
+def load_counts(session: Session, trade_date: date, index_id: int | None = None) -> Counts:
+    stmt = select(
+        ScreenerTimelineBucket.index_id,
+        ScreenerTimelineBucket.screener_id,
+        ScreenerTimelineBucket.bucket_minute,
+        ScreenerTimelineBucket.hits,
+    ).where(ScreenerTimelineBucket.trade_date == trade_date)
+    if index_id is not None:
+        stmt = stmt.where(ScreenerTimelineBucket.index_id == index_id)
+    return {(i, s, b): h for i, s, b, h in session.exec(stmt)}
+
+
+class TimelineRing:
+    """
+    Today's timeline in memory: {(index_id, screener_id): [hits] * 288}.
+
+    The writing process commits through `committing`, which numbers each commit
+    and applies its increments to the ring afterwards. Reads never wait for
+    writers: a reload reads the table without any lock, is only kept when no
+    commit overlapped that read, and replays the increments committed after it.
+    Processes that do not write (API workers in multi-worker mode) call
+    `mark_stale` on the 'timeline' topic and reload today's rows on the next read.
+    """
+
+    # Reloads spoiled by overlapping commits before a read serves the table as-is
+    RELOAD_ATTEMPTS = 3
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # one reload at a time; never taken by writers
+        self._day: date | None = None
+        self._rings: Dict[Tuple[int, int], List[int]] = {}
+        self._version = 0  # bumped by mark_stale
+        self._loaded_version = -1
+        self._commits_started = 0
+        self._commits_finished = 0
+        # (seq, trade_date, increments) committed while a reload is in progress
+        self._pending: List[Tuple[int, date, Counts]] | None = None
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    def _fresh(self, today: date) -> bool:
+        # Caller holds the lock
+        return self._day == today and self._loaded_version == self._version
+
+    def _ring(self, index_id: int, screener_id: int) -> List[int]:
+        ring = self._rings.get((index_id, screener_id))
+        if ring is None:
+            ring = [0] * BUCKETS_PER_DAY
+            self._rings[(index_id, screener_id)] = ring
+        return ring
+
+    def _apply(self, increments: Counts) -> None:
+        for (index_id, screener_id, bucket), hits in increments.items():
+            self._ring(index_id, screener_id)[bucket // BUCKET_MINUTES] += hits
+
+    @contextmanager
+    def committing(self, trade_date: date, increments: Counts) -> Iterator[None]:
+        """Wrap the commit that persists `increments` (as returned by `bump`)."""
+        with self._lock:
+            self._commits_started += 1
+            seq = self._commits_started
+        committed = False
+        try:
+            yield
+            committed = True
+        finally:
+            with self._lock:
+                self._commits_finished += 1
+                if committed and increments:
+                    if self._pending is not None:
+                        self._pending.append((seq, trade_date, increments))
+                    elif self._fresh(trade_date):
+                        self._apply(increments)
+                    # Otherwise the next reload reads them from the table
+
+    def _select(self, index_id: int) -> Counts:
+        # Caller holds the lock
+        return {
+            (index_id, screener_id, slot * BUCKET_MINUTES): hits
+            for (i, screener_id), ring in self._rings.items()
+            if i == index_id
+            for slot, hits in enumerate(ring)
+            if hits
+        }
+
+    def counts(self, today: date, index_id: int) -> Counts:
+        with self._lock:
+            if self._fresh(today):
+                return self._select(index_id)
+        with self._load_lock:
+            return self._reload(today, index_id)
+
+    def _reload(self, today: date, index_id: int) -> Counts:
+        for _ in range(self.RELOAD_ATTEMPTS):
+            with self._lock:
+                if self._fresh(today):
+                    return self._select(index_id)
+                version = self._version
+                watermark = self._commits_started
+                in_flight = watermark - self._commits_finished
+                self._pending = []
+
+            try:
+                with Session(engine) as session:
+                    counts = load_counts(session, today)
+            except BaseException:
+                with self._lock:
+                    self._pending = None
+                raise
+            # Commits numbered above this started after the read: not in `counts`
+            read_done = self._commits_started
+
+            with self._lock:
+                pending, self._pending = self._pending, None
+                # A commit in flight at the watermark or started during the
+                # read may or may not be in `counts`; retry rather than guess.
+                if in_flight or read_done != watermark or self._version != version:
+                    continue
+                self._rings = {}
+                for (i, screener_id, bucket), hits in counts.items():
+                    self._ring(i, screener_id)[bucket // BUCKET_MINUTES] = hits
+                for seq, trade_date, increments in pending:
+                    if seq > read_done and trade_date == today:
+                        self._apply(increments)
+                self._day = today
+                self._loaded_version = version
+                return self._select(index_id)
+
+        # Writes never paused long enough: serve the table, stay stale
+        return {key: hits for key, hits in counts.items() if key[0] == index_id}
+
+
+timeline_ring = TimelineRing()
+
+
+def series(counts: Counts, bucket_minutes: int = BUCKET_MINUTES) -> Tuple[List[int], Dict[int, List[int]]]:
+    """
+    Columnar view: sorted non-empty bucket starts, and per screener a list
+    of hits aligned with them. `bucket_minutes` must be a multiple of 5.
+    """
+    merged: Dict[Tuple[int, int], int] = defaultdict(int)
+    for (_, screener_id, bucket), hits in counts.items():
+        merged[(screener_id, bucket - bucket % bucket_minutes)] += hits
+
+    buckets = sorted({bucket for _, bucket in merged})
+    position = {bucket: i for i, bucket in enumerate(buckets)}
+
+    per_screener: Dict[int, List[int]] = {}
+    for (screener_id, bucket), hits in merged.items():
+        row = per_screener.setdefault(screener_id, [0] * len(buckets))
+        row[position[bucket]] = hits
+
+    return buckets, per_screener
+
+
+def rebuild(session: Session) -> int:
+    """Recompute every bucket from ScreenerEvent using current index membership."""
+    membership: Dict[int, List[int]] = defaultdict(list)
+    for index_id, symbol_id in session.exec(
+        select(IndexConstituent.index_id, IndexConstituent.symbol_id)
+    ):
+        membership[symbol_id].append(index_id)
+
+    totals: Counter = Counter()
+    events = session.exec(
+        select(
+            ScreenerEvent.trade_date,
+            ScreenerEvent.screener_id,
+            ScreenerEvent.symbol_id,
+            ScreenerEvent.triggered_at_time,
+        ).where(ScreenerEvent.triggered_at_time.is_not(None))
+    )
+    for trade_date, screener_id, symbol_id, trigger_time in events:
+        bucket = bucket_of(trigger_time)
+        for index_id in (ALL_SYMBOLS, *membership.get(symbol_id, ())):
+            totals[(trade_date, index_id, screener_id, bucket)] += 1
+
+    session.execute(delete(ScreenerTimelineBucket))
+    if totals:
+        session.execute(
+            insert(ScreenerTimelineBucket),
+            [
+                {
+                    "trade_date": trade_date,
+                    "index_id": index_id,
+                    "screener_id": screener_id,
+                    "bucket_minute": bucket,
+                    "hits": hits,
+                }
+                for (trade_date, index_id, screener_id, bucket), hits in totals.items()
+            ],
+        )
+    session.commit()
+    return len(totals)
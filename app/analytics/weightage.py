@@ -0,0 +1,171 @@
+"""
+Free-float market-cap index weightages, computed from the day's EOD snapshots:
+
+  basis  = close × issued size × (free-float mcap / total mcap)
+  weight = basis / Σ basis over the index's constituents × 100
+
+The ffmc / total ratio is unit-free, so NSE reporting its market caps in ₹ crore
+does not matter. A constituent without inputs for the day carries forward its most
+recent basis (up to CARRY_FORWARD_DAYS back); one with none at all is stored with a
+NULL weight, so an index's stored weights always add up to 100%.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import delete, func, insert, update
+from sqlmodel import Session, select
+
+from app.models.daily_symbol_snapshot import DailySymbolSnapshot
+from app.models.index_constituent import IndexConstituent
+from app.models.index_weightage_history import IndexWeightageHistory
+
+WEIGHTAGE_DIGITS = 4
+# How far back a member missing today's quote may borrow its market-cap basis
+CARRY_FORWARD_DAYS = 10
+IN_CHUNK_SIZE = 900
+
+
+def weight_basis(close: float | None, extra: Dict[str, Any] | None) -> float | None:
+    extra = extra or {}
+    issued = extra.get("issued_size")
+    if not close or not issued:
+        return None
+
+    basis = close * issued
+    ffmc = extra.get("free_float_market_cap")
+    total = extra.get("total_market_cap")
+    if ffmc and total:
+        basis *= min(ffmc / total, 1.0)
+    return basis
+
+
+def compute_weightages(
+    members: Dict[int, List[Tuple[int, int]]],
+    basis: Dict[int, float],
+) -> Dict[int, Dict[int, float | None]]:
+    """
+    members: {index_id: [(constituent_id, symbol_id), ...]}
+    basis:   {symbol_id: free-float market cap}
+
+    Returns {index_id: {constituent_id: weightage % | None}} covering every
+    member of each index that has at least one basis; members without a basis
+    get None, so the non-null weights of an index sum to 100. One pass per index.
+    """
+    weights: Dict[int, Dict[int, float | None]] = {}
+    for index_id, rows in members.items():
+        total = sum(basis[sid] for _, sid in rows if sid in basis)
+        if total <= 0:
+            continue
+        weights[index_id] = {
+            cid: round(basis[sid] / total * 100, WEIGHTAGE_DIGITS) if sid in basis else None
+            for cid, sid in rows
+        }
+    return weights
+
+
+def _carry_forward(
+    session: Session,
+    symbol_ids: List[int],
+    trade_date: date,
+    basis: Dict[int, float],
+) -> None:
+    """Fill `basis` for `symbol_ids` from their latest usable earlier snapshot."""
+    since = trade_date - timedelta(days=CARRY_FORWARD_DAYS)
+    for i in range(0, len(symbol_ids), IN_CHUNK_SIZE):
+        chunk = symbol_ids[i:i + IN_CHUNK_SIZE]
+        # Ascending, so the latest usable day wins
+        for symbol_id, close, extra in session.exec(
+            select(
+                DailySymbolSnapshot.symbol_id,
+                DailySymbolSnapshot.close_price,
+                DailySymbolSnapshot.extra_data,
+            )
+            .where(
+                DailySymbolSnapshot.symbol_id.in_(chunk),
+                DailySymbolSnapshot.trade_date >= since,
+                DailySymbolSnapshot.trade_date < trade_date,
+            )
+            .order_by(DailySymbolSnapshot.trade_date)
+        ):
+            b = weight_basis(close, extra)
+            if b is not None:
+                basis[symbol_id] = b
+
+
+def refresh_weightages(session: Session, trade_date: date) -> int:
+    """
+    Recompute every index's weightages for `trade_date` and store them in
+    IndexWeightageHistory. IndexConstituent.weightage is only overwritten
+    when `trade_date` is the latest computed date, so backfills of older
+    days leave the current weights alone.
+
+    Caller commits. Returns the number of constituents that got a weightage.
+    """
+    members: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    symbol_of: Dict[int, int] = {}
+    for cid, index_id, symbol_id in session.exec(
+        select(IndexConstituent.id, IndexConstituent.index_id, IndexConstituent.symbol_id)
+    ):
+        members[index_id].append((cid, symbol_id))
+        symbol_of[cid] = symbol_id
+
+    if not members:
+        return 0
+
+    basis: Dict[int, float] = {}
+    for symbol_id, close, extra in session.exec(
+        select(
+            DailySymbolSnapshot.symbol_id,
+            DailySymbolSnapshot.close_price,
+            DailySymbolSnapshot.extra_data,
+        ).where(DailySymbolSnapshot.trade_date == trade_date)
+    ):
+        b = weight_basis(close, extra)
+        if b is not None:
+            basis[symbol_id] = b
+
+    missing = sorted(set(symbol_of.values()) - basis.keys())
+    if missing:
+        _carry_forward(session, missing, trade_date, basis)
+
+    weights = compute_weightages(members, basis)
+    if not weights:
+        return 0
+
+    latest = session.exec(select(func.max(IndexWeightageHistory.trade_date))).one()
+
+    # 1️⃣ History: replace the day's rows per index, so a rerun with fewer
+    # quotes cannot leave stale weights behind
+    session.execute(
+        delete(IndexWeightageHistory).where(
+            IndexWeightageHistory.trade_date == trade_date,
+            IndexWeightageHistory.index_id.in_(list(weights)),
+        )
+    )
+    session.execute(
+        insert(IndexWeightageHistory),
+        [
+            {
+                "index_id": index_id,
+                "trade_date": trade_date,
+                "symbol_id": symbol_of[cid],
+                "weightage": w,
+            }
+            for index_id, by_constituent in weights.items()
+            for cid, w in by_constituent.items()
+            if w is not None
+        ],
+    )
+
+    # 2️⃣ Current weights, bulk-updated by primary key (NULL where no basis)
+    rows = [
+        {"id": cid, "weightage": w}
+        for by_constituent in weights.values()
+        for cid, w in by_constituent.items()
+    ]
+    if latest is None or trade_date >= latest:
+        session.execute(update(IndexConstituent), rows)
+
+    return sum(1 for row in rows if row["weightage"] is not None)
@@ -1,3 +1,9 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import secrets
+
 import uvicorn
 
 def dev():
@@ -9,8 +15,100 @@ def dev():
     )
 
 def prod():
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
+    """
+    WEB_CONCURRENCY=1 (default): one uvicorn process, as before.
+    WEB_CONCURRENCY=N: a single writer process owns every DB write (and the
+    scheduler); N uvicorn workers serve reads and forward writes over IPC.
+    """
+    from app.core.config import settings
+
+    if settings.WEB_CONCURRENCY <= 1:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+        )
+        return
+
+    from app.db.init_db import init_db
+    from app.writer.protocol import default_address
+    from app.writer.server import run_writer, wait_until_ready
+
+    init_db()  # once, before any worker starts
+
+    # Fresh key per run unless one is configured; the writer process and the
+    # uvicorn workers inherit it through the environment.
+    if not settings.WRITER_AUTHKEY:
+        settings.WRITER_AUTHKEY = secrets.token_hex(32)
+    os.environ["WRITER_AUTHKEY"] = settings.WRITER_AUTHKEY
+
+    address = settings.WRITER_ADDRESS or default_address()
+    writer_process = multiprocessing.Process(
+        target=run_writer,
+        args=(address,),
+        name="profitabull-writer",
     )
+    writer_process.start()
+    wait_until_ready(address)
+
+    # Inherited by the uvicorn workers → they delegate writes to the writer
+    os.environ["WRITER_ADDRESS"] = address
+    os.environ["SCHEDULER_ENABLED"] = "false"
+
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=settings.WEB_CONCURRENCY,
+        )
+    finally:
+        writer_process.terminate()
+        writer_process.join()
+
+def writer():
+    """Run the writer process on its own (WRITER_ADDRESS and WRITER_AUTHKEY are required)."""
+    from app.core.config import settings
+    from app.writer.server import run_writer
+
+    if not settings.WRITER_ADDRESS:
+        raise SystemExit("WRITER_ADDRESS must be set, e.g. /tmp/profitabull-writer.sock")
+    if not settings.WRITER_AUTHKEY:
+        raise SystemExit("WRITER_AUTHKEY must be set to a secret shared with the API workers")
+
+    run_writer(settings.WRITER_ADDRESS)
+
+def worker():
+    """
+    Dedicated scheduler process (run the API with SCHEDULER_ENABLED=false).
+
+        uv run worker                          # run jobs on their cron schedules
+        uv run worker --once nse_eod_ingestion # run one job now, under its lock
+    """
+    from app.core.config import settings
+    from app.db.init_db import init_db
+    from app.jobs.jobs import default_jobs
+    from app.jobs.scheduler import Scheduler
+
+    jobs = default_jobs()
+
+    parser = argparse.ArgumentParser(description="Profitabull job worker")
+    parser.add_argument("--once", choices=[job.name for job in jobs], help="Run one job now and exit")
+    args = parser.parse_args()
+
+    init_db()
+    scheduler = Scheduler(jobs, tz=settings.SCHEDULER_TIMEZONE)
+
+    async def run_once(name: str):
+        try:
+            await scheduler.run_job(name)
+        finally:
+            await scheduler.context.close()
+
+    try:
+        if args.once:
+            asyncio.run(run_once(args.once))
+        else:
+            asyncio.run(scheduler.run_forever())
+    except KeyboardInterrupt:
+        pass
@@ -1,8 +0,0 @@
-import os
-from dotenv import load_dotenv
-
-load_dotenv(override=True)
-
-class AppConfig:
-    def __init__(self):
-        self.db_url = os.getenv("DATABASE_URL")
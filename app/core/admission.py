@@ -0,0 +1,206 @@
+"""
+Admission control for write-heavy endpoints (today: the Chartink webhook).
+
+  * oversized payloads  → low-priority lane (one background thread, chunked work)
+  * per-key token bucket → 429 + Retry-After
+  * global in-flight cap → 503 + Retry-After
+
+State is per process: with WEB_CONCURRENCY > 1 every API worker enforces its own
+limits in front of the shared writer.
+"""
+
+import math
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+from fastapi import HTTPException
+
+from app.core.metrics import (
+    WEBHOOK_ADMISSION_TOTAL,
+    WEBHOOK_IN_FLIGHT,
+    WEBHOOK_LOW_PRIORITY_DEPTH,
+)
+
+ADMITTED = "admitted"
+LOW_PRIORITY = "low_priority"
+SHED_RATE_LIMITED = "shed_rate_limited"
+SHED_IN_FLIGHT = "shed_in_flight"
+SHED_LANE_FULL = "shed_lane_full"
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def is_full(self, now: float) -> bool:
+        """Refilled to `burst`, i.e. indistinguishable from a fresh bucket."""
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+    def take(self, cost: float = 1.0) -> float:
+        """Spend `cost` tokens; returns 0 on success, else seconds until affordable."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return (cost - self.tokens) / self.rate
+
+
+class LowPriorityLane:
+    """
+    Bounded FIFO drained by a single daemon thread.
+
+    Work queued here never runs concurrently with itself, so at most one
+    oversized alert competes with regular traffic for the write lock.
+    """
+
+    def __init__(self, maxsize: int, pause_seconds: float = 0.05):
+        self.pause_seconds = pause_seconds
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[[], None]) -> bool:
+        """False when the lane is full."""
+        try:
+            self._queue.put_nowait(func)
+        except queue.Full:
+            return False
+
+        WEBHOOK_LOW_PRIORITY_DEPTH.set(self._queue.qsize())
+        self._ensure_thread()
+        return True
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def join(self) -> None:
+        """Block until everything queued so far has been processed."""
+        self._queue.join()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="admission-low-priority", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            func = self._queue.get()
+            try:
+                func()
+            except Exception as exc:
+                print(f"❌ Low-priority task failed: {exc!r}")
+            finally:
+                self._queue.task_done()
+                WEBHOOK_LOW_PRIORITY_DEPTH.set(self._queue.qsize())
+            time.sleep(self.pause_seconds)
+
+
+@dataclass
+class AdmissionLimits:
+    max_items: int
+    rate: float
+    burst: float
+    max_in_flight: int
+    low_priority_queue: int
+    max_keys: int = 1024
+
+
+class AdmissionController:
+    def __init__(self, endpoint: str, limits: AdmissionLimits):
+        self.endpoint = endpoint
+        self.limits = limits
+        self.lane = LowPriorityLane(limits.low_priority_queue)
+        # LRU of per-key buckets. Keys come from unauthenticated requests, so
+        # the map is capped; see _bucket.
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._overflow = TokenBucket(limits.rate, limits.burst)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def admit(self, key: str, items: int) -> str:
+        """
+        Decide what happens to one request keyed by `key` carrying `items`.
+
+        Returns ADMITTED (caller must `release()` when done) or LOW_PRIORITY
+        (caller hands the work to `queue_low_priority`); raises HTTPException when shed.
+        """
+        with self._lock:
+            wait = self._bucket(key).take()
+            if wait:
+                self._shed(SHED_RATE_LIMITED, 429, wait)
+
+            if items > self.limits.max_items:
+                self._count(LOW_PRIORITY)
+                return LOW_PRIORITY
+
+            if self._in_flight >= self.limits.max_in_flight:
+                self._shed(SHED_IN_FLIGHT, 503, 1.0)
+
+            self._in_flight += 1
+            WEBHOOK_IN_FLIGHT.set(self._in_flight, endpoint=self.endpoint)
+
+        self._count(ADMITTED)
+        return ADMITTED
+
+    def _bucket(self, key: str) -> TokenBucket:
+        # Caller holds self._lock
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+
+        if len(self._buckets) >= self.limits.max_keys:
+            self._evict_idle()
+        if len(self._buckets) >= self.limits.max_keys:
+            # Every tracked key is mid-burst: new keys share one bucket instead
+            # of each getting a fresh burst (e.g. a flood of made-up scan_urls).
+            return self._overflow
+
+        bucket = TokenBucket(self.limits.rate, self.limits.burst)
+        self._buckets[key] = bucket
+        return bucket
+
+    def _evict_idle(self) -> None:
+        """Drop least-recently-used buckets that have refilled; nothing is lost."""
+        now = time.monotonic()
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if not bucket.is_full(now):
+                break
+            del self._buckets[key]
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            WEBHOOK_IN_FLIGHT.set(self._in_flight, endpoint=self.endpoint)
+
+    def queue_low_priority(self, func: Callable[[], None]) -> None:
+        if not self.lane.submit(func):
+            self._shed(SHED_LANE_FULL, 503, 5.0)
+
+    def _count(self, decision: str) -> None:
+        WEBHOOK_ADMISSION_TOTAL.inc(endpoint=self.endpoint, decision=decision)
+
+    def _shed(self, decision: str, status_code: int, retry_after: float) -> None:
+        self._count(decision)
+        retry = 60 if math.isinf(retry_after) else max(1, math.ceil(retry_after))
+        raise HTTPException(
+            status_code=status_code,
+            detail=decision,
+            headers={"Retry-After": str(retry)},
+        )
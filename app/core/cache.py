@@ -0,0 +1,43 @@
+"""
+Cache invalidation bus. Code that writes calls `invalidate(topic, ...)` after commit;
+in-process caches subscribe with `on_invalidate`. In multi-worker mode the writer
+process registers a broadcast hook so every API worker hears the same topics.
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List
+
+# Topics
+SYMBOLS = "symbols"
+INDICES = "indices"
+SCREENERS = "screeners"
+SCREENER_STATUS = "screener_status"
+SNAPSHOTS = "snapshots"
+TIMELINE = "timeline"
+ALL_TOPICS = (SYMBOLS, INDICES, SCREENERS, SCREENER_STATUS, SNAPSHOTS, TIMELINE)
+
+_handlers: Dict[str, List[Callable[[], None]]] = defaultdict(list)
+_broadcast_hooks: List[Callable[[tuple], None]] = []
+
+
+def on_invalidate(topic: str, handler: Callable[[], None]) -> None:
+    _handlers[topic].append(handler)
+
+
+def add_broadcast_hook(hook: Callable[[tuple], None]) -> None:
+    _broadcast_hooks.append(hook)
+
+
+def invalidate_local(topics: Iterable[str]) -> None:
+    for topic in topics:
+        for handler in list(_handlers.get(topic, ())):
+            try:
+                handler()
+            except Exception as e:
+                print(f"⚠️ Cache invalidation handler failed for {topic}: {e}")
+
+
+def invalidate(*topics: str) -> None:
+    invalidate_local(topics)
+    for hook in list(_broadcast_hooks):
+        hook(tuple(topics))
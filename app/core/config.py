@@ -3,6 +3,32 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///app/db/dev.db"
+    NSE_BASE_URL: str = "https://www.nseindia.com"
+
+    # Multi-worker prod: N API workers, all writes go to one writer process
+    WEB_CONCURRENCY: int = 1
+    WRITER_ADDRESS: str | None = None  # /path/to.sock or host:port; set = delegate writes
+    # Required for the IPC handshake; `uv run prod` generates one per run
+    WRITER_AUTHKEY: str | None = None
+
+    # In-process job scheduler (also runnable standalone via `uv run worker`)
+    SCHEDULER_ENABLED: bool = False
+    SCHEDULER_TIMEZONE: str = "Asia/Kolkata"
+    NSE_INGESTION_CRON: str = "0 18 * * 1-5"
+    INDEX_REFRESH_CRON: str = "0 8 * * 1-5"
+
+    # Webhook admission control (per API process)
+    WEBHOOK_MAX_SYMBOLS: int = 500  # larger alerts go to the low-priority lane
+    WEBHOOK_SCREENER_RATE: float = 1.0  # alerts/s refill per screener (scan_url)
+    WEBHOOK_SCREENER_BURST: int = 20
+    WEBHOOK_MAX_SCREENERS: int = 1024  # tracked buckets; extra scan_urls share one
+    WEBHOOK_MAX_IN_FLIGHT: int = 16  # beyond this: 503
+    WEBHOOK_WORKER_THREADS: int = 4  # own thread pool, never the one reads run on
+    WEBHOOK_LOW_PRIORITY_QUEUE: int = 50
+
+    # Opt-in SQL profiling (X-Query-Profile header + N+1 summary per request)
+    QUERY_PROFILING: bool = False
+    QUERY_PROFILE_N_PLUS_ONE_THRESHOLD: int = 5
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,390 @@
+"""
+In-process metrics registry rendered in the Prometheus text exposition format.
+Deliberately dependency-free: counters, gauges and histograms with static labels.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+COUNT_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], *extra: str) -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    parts.extend(e for e in extra if e)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self, const: str = "") -> List[str]:
+        """Sample lines; `const` is a pre-formatted label added to every sample."""
+        raise NotImplementedError
+
+    def render(self, const: str = "", extra_samples: Sequence[str] = ()) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples(const))
+        lines.extend(extra_samples)
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self, const: str = "") -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key, const)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self, const: str = "") -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key, const)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+
+@dataclass
+class _HistogramState:
+    buckets: List[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+        self._states: Dict[LabelKey, _HistogramState] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        # Index of the first bucket whose upper bound is >= value.
+        slot = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = _HistogramState(buckets=[0] * len(self.upper_bounds))
+                self._states[key] = state
+            if slot < len(state.buckets):
+                state.buckets[slot] += 1
+            state.count += 1
+            state.total += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels: str) -> Tuple[int, float]:
+        """(count, sum) for one label set; handy for benchmarks and tests."""
+        state = self._states.get(self._key(labels))
+        return (state.count, state.total) if state else (0, 0.0)
+
+    def _samples(self, const: str = "") -> List[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(s.buckets), s.count, s.total)
+                for key, s in self._states.items()
+            )
+        lines = []
+        for key, buckets, count, total in items:
+            cumulative = 0
+            for bound, n in zip(self.upper_bounds, buckets):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, const, le)} {cumulative}"
+                )
+            inf = 'le="+Inf"'
+            lines.append(
+                f"{self.name}_bucket{_format_labels(self.labelnames, key, const, inf)} {count}"
+            )
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key, const)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key, const)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _sorted(self) -> List[_Metric]:
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def samples(self, const: str = "") -> Dict[str, List[str]]:
+        """Sample lines per metric name, without HELP/TYPE; see `render(merge=...)`."""
+        return {m.name: m._samples(const) for m in self._sorted()}
+
+    def render(self, const: str = "", merge: Dict[str, List[str]] | None = None) -> str:
+        """
+        `merge` adds another process's `samples()` under the same HELP/TYPE
+        lines; both sides need a distinguishing `const` label.
+        """
+        merge = merge or {}
+        return "\n".join(m.render(const, merge.get(m.name, ())) for m in self._sorted()) + "\n"
+
+
+def process_label(value: str) -> str:
+    return f'process="{_escape(value)}"'
+
+
+REGISTRY = Registry()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --- HTTP ---
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "profitabull_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+
+# --- Database ---
+DB_QUERIES_TOTAL = REGISTRY.counter(
+    "profitabull_db_queries_total",
+    "SQL statements executed through the engine",
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "profitabull_db_query_duration_seconds",
+    "Latency of individual SQL statements",
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    "profitabull_db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+DB_SECONDS_PER_REQUEST = REGISTRY.histogram(
+    "profitabull_db_time_per_request_seconds",
+    "Total SQL time spent per HTTP request",
+    ("route",),
+)
+
+# --- Webhooks ---
+WEBHOOK_SYMBOLS_PER_ALERT = REGISTRY.histogram(
+    "profitabull_webhook_symbols_per_alert",
+    "Number of symbols carried by one Chartink alert",
+    buckets=COUNT_BUCKETS,
+)
+WEBHOOK_PROCESSING_SECONDS = REGISTRY.histogram(
+    "profitabull_webhook_processing_seconds",
+    "Time spent processing one Chartink alert",
+)
+WEBHOOK_ADMISSION_TOTAL = REGISTRY.counter(
+    "profitabull_webhook_admission_total",
+    "Admission decisions (admitted, low_priority, shed_rate_limited, shed_in_flight, shed_lane_full)",
+    ("endpoint", "decision"),
+)
+WEBHOOK_IN_FLIGHT = REGISTRY.gauge(
+    "profitabull_webhook_in_flight",
+    "Admitted webhook requests currently being processed",
+    ("endpoint",),
+)
+WEBHOOK_LOW_PRIORITY_DEPTH = REGISTRY.gauge(
+    "profitabull_webhook_low_priority_depth",
+    "Oversized alerts waiting in the low-priority lane",
+)
+
+# --- NSE ---
+NSE_FETCH_SECONDS = REGISTRY.histogram(
+    "profitabull_nse_fetch_duration_seconds",
+    "Latency of one NSE quote fetch attempt",
+)
+NSE_FETCH_RETRIES_TOTAL = REGISTRY.counter(
+    "profitabull_nse_fetch_retries_total",
+    "NSE quote fetches that were retried",
+)
+NSE_FETCH_ERRORS_TOTAL = REGISTRY.counter(
+    "profitabull_nse_fetch_errors_total",
+    "NSE quote fetches that failed, by error class",
+    ("error_class",),
+)
+
+# --- Ingestion ---
+INGESTION_SYMBOLS_TOTAL = REGISTRY.counter(
+    "profitabull_ingestion_symbols_total",
+    "Symbols written by ingestion jobs",
+    ("job",),
+)
+INGESTION_SECONDS = REGISTRY.histogram(
+    "profitabull_ingestion_duration_seconds",
+    "End-to-end duration of ingestion jobs",
+    ("job",),
+)
+INGESTION_SYMBOLS_PER_SECOND = REGISTRY.gauge(
+    "profitabull_ingestion_symbols_per_second",
+    "Throughput of the most recent ingestion run",
+    ("job",),
+)
+
+# --- Scheduler ---
+JOB_RUNS_TOTAL = REGISTRY.counter(
+    "profitabull_job_runs_total",
+    "Scheduled job runs by outcome (success, failed, skipped_locked, error)",
+    ("job", "status"),
+)
+JOB_SECONDS = REGISTRY.histogram(
+    "profitabull_job_duration_seconds",
+    "Duration of scheduled job runs",
+    ("job",),
+)
+
+# --- Ad-hoc timers (app.utils.timed) ---
+TIMED_SECONDS = REGISTRY.histogram(
+    "profitabull_timed_seconds",
+    "Duration of functions wrapped with app.utils.timed",
+    ("label",),
+)
+
+
+# --- Per-request DB accounting ---
+# The middleware installs a QueryStats for the request and the engine listeners
+# in app.db.instrumentation add to whatever is current.
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def record_query(elapsed: float) -> None:
+    DB_QUERIES_TOTAL.inc()
+    DB_QUERY_SECONDS.observe(elapsed)
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+def record_ingestion(job: str, symbols: int, elapsed: float) -> None:
+    INGESTION_SYMBOLS_TOTAL.inc(symbols, job=job)
+    INGESTION_SECONDS.observe(elapsed, job=job)
+    if elapsed > 0:
+        INGESTION_SYMBOLS_PER_SECOND.set(symbols / elapsed, job=job)
@@ -0,0 +1,60 @@
+import time
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_SECONDS_PER_REQUEST,
+    HTTP_REQUEST_SECONDS,
+    QueryStats,
+    current_query_stats,
+)
+from app.db.profiler import profile_queries
+
+
+def route_label(request: Request) -> str:
+    """Route template (e.g. /dashboard) so labels stay low-cardinality."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def metrics_middleware(request: Request, call_next):
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    start = time.perf_counter()
+    status = 500
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        current_query_stats.reset(token)
+
+        route = route_label(request)
+        HTTP_REQUEST_SECONDS.observe(
+            elapsed, method=request.method, route=route, status=str(status)
+        )
+        DB_QUERIES_PER_REQUEST.observe(stats.count, route=route)
+        DB_SECONDS_PER_REQUEST.observe(stats.seconds, route=route)
+
+
+async def query_profile_middleware(request: Request, call_next):
+    """
+    Profile the SQL of each request. Enabled with QUERY_PROFILING=true.
+
+    Adds an `X-Query-Profile` header and prints a summary that flags
+    statements repeated at least QUERY_PROFILE_N_PLUS_ONE_THRESHOLD times.
+    """
+    with profile_queries(
+        f"{request.method} {request.url.path}",
+        n_plus_one_threshold=settings.QUERY_PROFILE_N_PLUS_ONE_THRESHOLD,
+        report=False,
+    ) as profile:
+        response = await call_next(request)
+
+    response.headers["X-Query-Profile"] = profile.header_value()
+    print(profile.summary())
+    return response
@@ -1,8 +1,21 @@
+from sqlalchemy import event
 from sqlmodel import create_engine
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
 
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False},
     echo=False,
 )
+
+instrument_engine(engine)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # Per-connection setting, so it must be applied to every pooled connection
+    # (WAL itself is persistent and is set once by init_db).
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
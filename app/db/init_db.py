@@ -1,11 +1,63 @@
-from sqlmodel import SQLModel, Session, text
+import hashlib
+
+from sqlmodel import SQLModel
 from app.db.engine import engine
 
 import app.models
 
+
+def schema_fingerprint() -> int:
+    """
+    Stable hash of the declared schema (tables, columns, types, indexes).
+
+    Truncated to 28 bits so it fits SQLite's `PRAGMA user_version`.
+    """
+    h = hashlib.sha256()
+    for table in sorted(SQLModel.metadata.tables.values(), key=lambda t: t.name):
+        h.update(table.name.encode())
+        for col in table.columns:
+            fks = ",".join(sorted(fk.target_fullname for fk in col.foreign_keys))
+            h.update(
+                f"|{col.name}:{col.type!r}:{col.nullable}:{col.primary_key}:{col.unique}:{fks}".encode()
+            )
+        for idx in sorted(table.indexes, key=lambda i: i.name or ""):
+            cols = ",".join(c.name for c in idx.columns)
+            h.update(f"|ix:{idx.name}:{cols}:{idx.unique}".encode())
+        constraints = sorted(
+            f"{type(c).__name__}:{c.name}:{','.join(col.name for col in c.columns)}"
+            for c in table.constraints
+        )
+        for constraint in constraints:
+            h.update(f"|c:{constraint}".encode())
+    return int(h.hexdigest()[:7], 16)
+
+
 def init_db():
+    """
+    Create missing tables and indexes and enable WAL, but only when the
+    schema changed.
+
+    The fingerprint of the declared models is stored in `PRAGMA user_version`;
+    when it matches, startup skips `create_all` and its per-table reflection.
+    `synchronous=NORMAL` is per-connection and is applied in app.db.engine.
+    """
+    fingerprint = schema_fingerprint()
+
+    with engine.connect() as conn:
+        stored = conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+    if stored == fingerprint:
+        return
+
     SQLModel.metadata.create_all(engine)
 
-    with Session(engine) as session:
-        session.exec(text("PRAGMA journal_mode=WAL;"))
-        session.exec(text("PRAGMA synchronous=NORMAL;"))
+    # create_all skips tables that already exist, including any index added
+    # to their model since; create those one by one.
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for idx in table.indexes:
+                idx.create(conn, checkfirst=True)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        conn.exec_driver_sql(f"PRAGMA user_version={fingerprint}")
@@ -0,0 +1,32 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import record_query
+from app.db.profiler import record_statement
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    record_query(elapsed)
+    record_statement(statement, elapsed)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach SQL timing listeners to an engine.
+
+    Every statement is counted globally and against the QueryStats of
+    the current request (see app.core.metrics.current_query_stats), and
+    recorded in the active QueryProfile, if any (see app.db.profiler).
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,124 @@
+"""
+Opt-in SQL profiler. Records every statement executed while a profile is active,
+groups them by normalized shape and flags N+1 patterns. Works for HTTP requests
+(see app.core.middleware.query_profile_middleware) and for standalone scripts.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a statement to its shape so repeats group together.
+
+    Literals become `?` and `IN (?, ?, ...)` lists collapse to `IN (...)`,
+    so the same query with a different number of bound values still matches.
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class StatementGroup:
+    statement: str
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class QueryProfile:
+    label: str
+    n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD
+    groups: Dict[str, StatementGroup] = field(default_factory=dict)
+    count: int = 0
+    seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    def record(self, statement: str, elapsed: float) -> None:
+        shape = normalize_statement(statement)
+        group = self.groups.get(shape)
+        if group is None:
+            group = StatementGroup(statement=shape)
+            self.groups[shape] = group
+        group.count += 1
+        group.seconds += elapsed
+        self.count += 1
+        self.seconds += elapsed
+
+    @property
+    def n_plus_one(self) -> List[StatementGroup]:
+        """Statement shapes repeated at least `n_plus_one_threshold` times."""
+        flagged = [g for g in self.groups.values() if g.count >= self.n_plus_one_threshold]
+        return sorted(flagged, key=lambda g: g.count, reverse=True)
+
+    def header_value(self) -> str:
+        return (
+            f"count={self.count};"
+            f"distinct={len(self.groups)};"
+            f"time_ms={self.seconds * 1000:.1f};"
+            f"n_plus_one={len(self.n_plus_one)}"
+        )
+
+    def summary(self, limit: int = 5) -> str:
+        lines = [
+            f"🔎 {self.label}: {self.count} queries ({len(self.groups)} distinct) "
+            f"in {self.seconds * 1000:.1f}ms SQL / {self.wall_seconds * 1000:.1f}ms wall"
+        ]
+        for group in self.n_plus_one[:limit]:
+            lines.append(
+                f"   ⚠️ N+1 x{group.count} ({group.seconds * 1000:.1f}ms): "
+                f"{group.statement[:160]}"
+            )
+        return "\n".join(lines)
+
+
+current_query_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "current_query_profile", default=None
+)
+
+
+def record_statement(statement: str, elapsed: float) -> None:
+    profile = current_query_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+
+
+@contextmanager
+def profile_queries(
+    label: str,
+    *,
+    n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+    report: bool = True,
+) -> Iterator[QueryProfile]:
+    """
+    Profile every SQL statement executed inside the block.
+
+    Usage:
+        with profile_queries("load_index_from_csv") as profile:
+            main(...)
+        # summary is printed on exit; `profile` stays inspectable
+    """
+    profile = QueryProfile(label=label, n_plus_one_threshold=n_plus_one_threshold)
+    token = current_query_profile.set(profile)
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.wall_seconds = time.perf_counter() - start
+        current_query_profile.reset(token)
+        if report:
+            print(profile.summary())
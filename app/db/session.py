@@ -1,3 +1,5 @@
+import threading
+
 from sqlmodel import Session
 from app.db.engine import engine
 
@@ -5,3 +7,8 @@ from app.db.engine import engine
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+# Serializes writers within one process: request threads, the scheduler and,
+# in multi-worker mode, the writer process's command thread.
+write_lock = threading.RLock()
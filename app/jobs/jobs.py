@@ -0,0 +1,36 @@
+import asyncio
+from pathlib import Path
+from typing import List
+
+from app.core.config import settings
+from app.jobs.cron import CronSchedule
+from app.jobs.scheduler import Job, JobContext
+
+RESOURCES_DIR = Path(__file__).resolve().parents[2] / "resources"
+
+
+async def nse_eod_ingestion(ctx: JobContext) -> None:
+    from app.scripts.nse_snapshot_ingestion import ingest_nse_eod_snapshots
+
+    await ingest_nse_eod_snapshots(client=ctx.nse_client)
+
+
+async def index_refresh(ctx: JobContext) -> None:
+    from app.scripts.load_index_from_csv import main_all
+
+    await asyncio.to_thread(main_all, RESOURCES_DIR)
+
+
+def default_jobs() -> List[Job]:
+    return [
+        Job(
+            name="nse_eod_ingestion",
+            schedule=CronSchedule.parse(settings.NSE_INGESTION_CRON),
+            func=nse_eod_ingestion,
+        ),
+        Job(
+            name="index_refresh",
+            schedule=CronSchedule.parse(settings.INDEX_REFRESH_CRON),
+            func=index_refresh,
+        ),
+    ]
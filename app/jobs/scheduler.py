@@ -0,0 +1,228 @@
+import asyncio
+import os
+import socket
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Set
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.core.metrics import JOB_RUNS_TOTAL, JOB_SECONDS
+from app.db.engine import engine
+from app.jobs.cron import CronSchedule
+from app.models.job_run import JobRun
+from app.models.scheduled_job import ScheduledJob
+
+
+class JobContext:
+    """
+    Long-lived resources shared by every run of every job.
+
+    The SQLModel engine is already process-wide; the NSE client is created
+    on first use and kept warm (connection pool + cookies) between runs.
+    """
+
+    def __init__(self):
+        self._nse_client = None
+
+    @property
+    def nse_client(self):
+        if self._nse_client is None:
+            from app.nse.nse import NSEClient
+
+            self._nse_client = NSEClient()
+        return self._nse_client
+
+    async def close(self) -> None:
+        if self._nse_client is not None:
+            await self._nse_client.close()
+            self._nse_client = None
+
+
+@dataclass
+class Job:
+    name: str
+    schedule: CronSchedule
+    func: Callable[[JobContext], Awaitable[None]]
+    lock_ttl: timedelta = field(default=timedelta(hours=2))
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# --- DB helpers (sync; called via asyncio.to_thread) ---
+
+def _register(job: Job) -> None:
+    # Insert-if-missing in one statement: concurrent registrations (two runs
+    # of one job, or the API scheduler and `worker --once`) must not race.
+    with Session(engine) as session:
+        session.execute(
+            sqlite_insert(ScheduledJob)
+            .values(name=job.name, cron=job.schedule.expression)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        session.execute(
+            update(ScheduledJob)
+            .where(ScheduledJob.name == job.name)
+            .where(ScheduledJob.cron != job.schedule.expression)
+            .values(cron=job.schedule.expression)
+        )
+        session.commit()
+
+
+def _acquire(job: Job, owner: str, now: datetime) -> bool:
+    """Claim the job's lease atomically; False if another run holds it."""
+    with Session(engine) as session:
+        result = session.execute(
+            update(ScheduledJob)
+            .where(ScheduledJob.name == job.name)
+            .where(
+                or_(
+                    ScheduledJob.locked_until.is_(None),
+                    ScheduledJob.locked_until < now,
+                )
+            )
+            .values(
+                locked_by=owner,
+                locked_until=now + job.lock_ttl,
+                last_started_at=now,
+                last_status="running",
+            )
+        )
+        session.commit()
+        return result.rowcount == 1
+
+
+def _start_run(job: Job, owner: str, now: datetime) -> int:
+    with Session(engine) as session:
+        run = JobRun(job_name=job.name, started_at=now, worker=owner)
+        session.add(run)
+        session.commit()
+        session.refresh(run)
+        return run.id
+
+
+def _finish_run(job: Job, run_id: int, owner: str, status: str, duration: float, error: str | None) -> None:
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        run = session.get(JobRun, run_id)
+        run.finished_at = now
+        run.duration_seconds = duration
+        run.status = status
+        run.error = error
+        session.add(run)
+
+        session.execute(
+            update(ScheduledJob)
+            .where(ScheduledJob.name == job.name)
+            .where(ScheduledJob.locked_by == owner)
+            .values(
+                locked_by=None,
+                locked_until=None,
+                last_finished_at=now,
+                last_duration_seconds=duration,
+                last_status=status,
+                last_error=error,
+            )
+        )
+        session.commit()
+
+
+class Scheduler:
+    """
+    Cron-style asyncio scheduler.
+
+    Each job sleeps until its next fire time, then runs under a DB lease
+    so overlapping runs (same process, another worker, or a manual run)
+    are skipped rather than contending for the SQLite writer.
+    """
+
+    def __init__(self, jobs: List[Job], *, tz: str = "UTC"):
+        self.jobs: Dict[str, Job] = {job.name: job for job in jobs}
+        self.tz = ZoneInfo(tz)
+        self.context = JobContext()
+        self.owner = worker_id()
+        self._tasks: List[asyncio.Task] = []
+        self._registered: Set[str] = set()
+
+    async def _ensure_registered(self, job: Job) -> None:
+        # The lease lives on the ScheduledJob row, so it must exist before
+        # the first _acquire (including one-off `worker --once` runs).
+        if job.name not in self._registered:
+            await asyncio.to_thread(_register, job)
+            self._registered.add(job.name)
+
+    async def start(self) -> None:
+        for job in self.jobs.values():
+            await self._ensure_registered(job)
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+        print(f"⏰ Scheduler started ({', '.join(self.jobs)}) as {self.owner}")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self.context.close()
+
+    async def run_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def _loop(self, job: Job) -> None:
+        while True:
+            now = datetime.now(self.tz)
+            next_run = job.schedule.next_after(now)
+            await asyncio.sleep((next_run - now).total_seconds())
+            try:
+                await self.run_job(job.name)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # e.g. "database is locked" in the lease/run bookkeeping: log it
+                # and keep the job scheduled rather than ending this task.
+                JOB_RUNS_TOTAL.inc(job=job.name, status="error")
+                print(f"🔥 Job {job.name} scheduling error:\n{traceback.format_exc(limit=5)}")
+
+    async def run_job(self, name: str) -> bool:
+        """Run one job now under its lease. Returns False if it was skipped."""
+        job = self.jobs[name]
+        await self._ensure_registered(job)
+        now = datetime.now(timezone.utc)
+
+        if not await asyncio.to_thread(_acquire, job, self.owner, now):
+            JOB_RUNS_TOTAL.inc(job=job.name, status="skipped_locked")
+            print(f"⏭️ Job {job.name} skipped: already running elsewhere")
+            return False
+
+        run_id = await asyncio.to_thread(_start_run, job, self.owner, now)
+        start = time.perf_counter()
+        status, error = "success", None
+
+        try:
+            await job.func(self.context)
+        except asyncio.CancelledError:
+            status, error = "failed", "cancelled"
+            raise
+        except Exception:
+            status, error = "failed", traceback.format_exc(limit=5)
+            print(f"🔥 Job {job.name} failed:\n{error}")
+        finally:
+            duration = time.perf_counter() - start
+            JOB_RUNS_TOTAL.inc(job=job.name, status=status)
+            JOB_SECONDS.observe(duration, job=job.name)
+            await asyncio.to_thread(
+                _finish_run, job, run_id, self.owner, status, duration, error
+            )
+
+        print(f"⏰ Job {job.name} {status} in {duration:.2f}s")
+        return True
@@ -3,6 +3,10 @@ from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import Session, select
 
+from app.analytics.timeline import timeline_ring
+from app.core import cache
+from app.core.config import settings
+from app.core.middleware import metrics_middleware, query_profile_middleware
 from app.db.init_db import init_db
 
 from app.db.session import get_session
@@ -11,12 +15,38 @@ from app.routers.webhooks import router as webhook_router
 from app.routers.indices import router as indices_router
 from app.routers.screeners import router as screeners_router
 from app.routers.dashboard import router as dashboard_router
+from app.routers.metrics import router as metrics_router
+from app.routers.analytics import router as analytics_router
+from app.routers.symbols import router as symbols_router
+from app.search.symbol_index import symbol_index
+from app.writer import client as writer_client
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    symbol_index.install()
+
+    scheduler = None
+    subscriber = None
+    if writer_client.enabled():
+        # API worker in multi-worker mode: the writer process hosts the
+        # scheduler; we only listen for its cache invalidations.
+        cache.on_invalidate(cache.TIMELINE, timeline_ring.mark_stale)
+        subscriber = writer_client.start_subscriber()
+    elif settings.SCHEDULER_ENABLED:
+        from app.jobs.jobs import default_jobs
+        from app.jobs.scheduler import Scheduler
+
+        scheduler = Scheduler(default_jobs(), tz=settings.SCHEDULER_TIMEZONE)
+        await scheduler.start()
+
     yield
 
+    if scheduler:
+        await scheduler.stop()
+    if subscriber:
+        subscriber.set()
+
 app = FastAPI(
     title="Profitabull API",
     version="0.1.0",
@@ -27,6 +57,14 @@ app.include_router(webhook_router)
 app.include_router(indices_router)
 app.include_router(screeners_router)
 app.include_router(dashboard_router)
+app.include_router(metrics_router)
+app.include_router(symbols_router)
+app.include_router(analytics_router)
+
+app.middleware("http")(metrics_middleware)
+
+if settings.QUERY_PROFILING:
+    app.middleware("http")(query_profile_middleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -2,8 +2,13 @@ from app.models.daily_screener_status import DailyScreenerStatus
 from app.models.daily_symbol_snapshot import DailySymbolSnapshot
 from app.models.index import Index
 from app.models.index_constituent import IndexConstituent
+from app.models.index_weightage_history import IndexWeightageHistory
+from app.models.job_run import JobRun
+from app.models.scheduled_job import ScheduledJob
 from app.models.screener import Screener
 from app.models.screener_event import ScreenerEvent
+from app.models.screener_hit_rollup import ScreenerHitRollup
+from app.models.screener_timeline_bucket import ScreenerTimelineBucket
 from app.models.symbol import Symbol
 
 
@@ -13,4 +18,9 @@ __all__ = ["Symbol",
            "Screener",
            "ScreenerEvent",
            "DailyScreenerStatus",
-           "DailySymbolSnapshot"]
\ No newline at end of file
+           "DailySymbolSnapshot",
+           "ScheduledJob",
+           "JobRun",
+           "ScreenerHitRollup",
+           "ScreenerTimelineBucket",
+           "IndexWeightageHistory"]
\ No newline at end of file
@@ -1,8 +1,17 @@
 from datetime import date, datetime
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
 class DailyScreenerStatus(SQLModel, table=True):
+    __table_args__ = (
+        # Per-symbol hit history (/symbols/{symbol}/history), index-only
+        Index(
+            "ix_daily_screener_status_symbol_date",
+            "symbol_id", "trade_date", "screener_id",
+        ),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
 
     symbol_id: int = Field(foreign_key="symbol.id", index=True)
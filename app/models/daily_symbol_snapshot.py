@@ -2,7 +2,7 @@ from datetime import date, datetime, timezone
 from typing import Any, Dict, Optional
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, JSON
 
 
 class DailySymbolSnapshot(SQLModel, table=True):
@@ -13,6 +13,15 @@ class DailySymbolSnapshot(SQLModel, table=True):
     Idempotency is handled in ingestion code, NOT via DB constraints.
     """
 
+    __table_args__ = (
+        # Covering index for per-symbol history: range scan on (symbol_id,
+        # trade_date) that never touches the table rows.
+        Index(
+            "ix_daily_symbol_snapshot_symbol_date",
+            "symbol_id", "trade_date", "close_price", "change_pct", "volume",
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # --- Foreign keys ---
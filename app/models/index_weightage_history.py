@@ -0,0 +1,28 @@
+from datetime import date
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+
+class IndexWeightageHistory(SQLModel, table=True):
+    """
+    Free-float market-cap weightage of one constituent on one trade date.
+
+    Written by EOD ingestion (app.analytics.weightage) alongside the update of
+    IndexConstituent.weightage, so date-range queries read stored values
+    instead of recomputing them from snapshots.
+    """
+
+    __table_args__ = (
+        UniqueConstraint(
+            "index_id", "trade_date", "symbol_id",
+            name="uq_index_weightage_history",
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+
+    index_id: int = Field(foreign_key="index.id")
+    trade_date: date
+    symbol_id: int = Field(foreign_key="symbol.id", index=True)
+
+    weightage: float
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+
+class JobRun(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+
+    job_name: str = Field(index=True)
+    started_at: datetime = Field(index=True)
+    finished_at: datetime | None = None
+    duration_seconds: float | None = None
+
+    status: str = Field(default="running")  # running | success | failed
+    error: str | None = None
+    worker: str | None = None
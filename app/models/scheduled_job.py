@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+
+class ScheduledJob(SQLModel, table=True):
+    """
+    One row per scheduler job.
+
+    Doubles as a cross-process lease: a run only starts if it can claim
+    `locked_until`, so scheduled runs in the API process and in the worker
+    (including `uv run worker --once JOB`) never overlap. Running the scripts
+    in app/scripts directly bypasses the lease.
+    """
+
+    id: int | None = Field(default=None, primary_key=True)
+    name: str = Field(unique=True, index=True)
+    cron: str
+
+    locked_by: str | None = None
+    locked_until: datetime | None = None
+
+    last_started_at: datetime | None = None
+    last_finished_at: datetime | None = None
+    last_duration_seconds: float | None = None
+    last_status: str | None = None
+    last_error: str | None = None
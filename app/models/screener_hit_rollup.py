@@ -0,0 +1,31 @@
+from datetime import date
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+
+class ScreenerHitRollup(SQLModel, table=True):
+    """
+    Pre-aggregated DailyScreenerStatus per (grain, period, screener, symbol).
+
+    grain is "week" (period_start = Monday) or "month" (period_start = 1st).
+    Maintained by the webhook in the same transaction as the status upsert;
+    rebuild with app/scripts/rebuild_screener_rollups.py.
+    """
+
+    __table_args__ = (
+        UniqueConstraint(
+            "grain", "period_start", "screener_id", "symbol_id",
+            name="uq_screener_hit_rollup",
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+
+    grain: str
+    period_start: date
+
+    screener_id: int = Field(foreign_key="screener.id", index=True)
+    symbol_id: int = Field(foreign_key="symbol.id", index=True)
+
+    hit_days: int = Field(default=0)
+    trigger_count: int = Field(default=0)
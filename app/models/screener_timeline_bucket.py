@@ -0,0 +1,29 @@
+from datetime import date
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+
+class ScreenerTimelineBucket(SQLModel, table=True):
+    """
+    Screener hits per 5-minute bucket of the session, per index.
+
+    bucket_minute is the bucket start as minutes since midnight (e.g. 555 = 09:15).
+    index_id 0 means "all symbols" (no FK, so it can sit in the unique key).
+    Maintained by the webhook; rebuild with app/scripts/rebuild_screener_rollups.py.
+    """
+
+    __table_args__ = (
+        UniqueConstraint(
+            "trade_date", "index_id", "screener_id", "bucket_minute",
+            name="uq_screener_timeline_bucket",
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+
+    trade_date: date
+    index_id: int
+    screener_id: int = Field(foreign_key="screener.id", index=True)
+    bucket_minute: int
+
+    hits: int = Field(default=0)
@@ -1,25 +1,35 @@
 import asyncio
-import json
-from pathlib import Path
 import time
-import aiofiles
 import httpx
 from typing import Dict, Any, List
 
 from pydantic import BaseModel
+from app.core.config import settings
+from app.core.metrics import NSE_FETCH_ERRORS_TOTAL, NSE_FETCH_RETRIES_TOTAL, NSE_FETCH_SECONDS
 from app.utils import time_async
 
 
 class NSEClient:
-    BASE_URL = "https://www.nseindia.com"
     API_PATH = "/api/NextApi/apiClient/GetQuoteApi"
-
-    def __init__(self, timeout: float = 10.0):
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    REWARM_STATUSES = {401, 403}
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        *,
+        base_url: str | None = None,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+    ):
         self.client = httpx.AsyncClient(
             timeout=timeout,
             follow_redirects=True,
             headers=self._base_headers(),
         )
+        self.base_url = (base_url or settings.NSE_BASE_URL).rstrip("/")
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self._warmed = False
 
     @staticmethod
@@ -47,7 +57,7 @@ class NSEClient:
     def _api_headers(self, symbol: str) -> Dict[str, str]:
         return {
             "Accept": "*/*",
-            "Referer": f"{self.BASE_URL}/get-quote/equity/{symbol}",
+            "Referer": f"{self.base_url}/get-quote/equity/{symbol}",
             "Sec-Fetch-Site": "same-origin",
             "Sec-Fetch-Mode": "cors",
             "Sec-Fetch-Dest": "empty",
@@ -57,7 +67,7 @@ class NSEClient:
         if self._warmed:
             return
         r = await self.client.get(
-            self.BASE_URL,
+            self.base_url,
             headers=self._warmup_headers(),
         )
 
@@ -71,6 +81,19 @@ class NSEClient:
     async def fetch_quote(self, symbol: str) -> Dict[str, Any]:
         await self.warm_up()
 
+        r = await self._get_quote(symbol)
+
+        if r.status_code in self.REWARM_STATUSES:
+            # Session cookies from an earlier warm-up have expired (long-lived
+            # clients, e.g. the scheduler's); take fresh ones and retry once.
+            self._warmed = False
+            await self.warm_up()
+            r = await self._get_quote(symbol)
+
+        r.raise_for_status()
+        return r.json()
+
+    async def _get_quote(self, symbol: str) -> httpx.Response:
         params = {
             "functionName": "getSymbolData",
             "marketType": "N",
@@ -78,14 +101,29 @@ class NSEClient:
             "symbol": symbol,
         }
 
-        r = await self.client.get(
-            f"{self.BASE_URL}{self.API_PATH}",
-            params=params,
-            headers=self._api_headers(symbol),
-        )
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                r = await self.client.get(
+                    f"{self.base_url}{self.API_PATH}",
+                    params=params,
+                    headers=self._api_headers(symbol),
+                )
+                retryable = r.status_code in self.RETRY_STATUSES
+            except httpx.RequestError:
+                if attempt >= self.max_retries:
+                    raise
+                retryable = True
+            finally:
+                NSE_FETCH_SECONDS.observe(time.perf_counter() - start)
 
-        r.raise_for_status()
-        return r.json()
+            if not retryable or attempt >= self.max_retries:
+                return r
+
+            attempt += 1
+            NSE_FETCH_RETRIES_TOTAL.inc()
+            await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
 
     async def close(self):
         await self.client.aclose()
@@ -99,21 +137,40 @@ class NSEData(BaseModel):
     delivery_volume : float
     delivery_pct : float
 
+    # Market-cap inputs for index weightages; not every quote carries them
+    issued_size : float | None = None
+    free_float_market_cap : float | None = None
+    total_market_cap : float | None = None
+
+
+def _optional(eq: Dict[str, Any], section: str, key: str) -> float | None:
+    """Optional numeric field; absent or malformed values never fail the quote."""
+    try:
+        return float((eq.get(section) or {})[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
 async def fetch_eod_data(
     symbols: List[str],
     *,
     delay_seconds: float = 0.0,
+    client: NSEClient | None = None,
 ) -> Dict[str, NSEData]:
     """
     Fetch NSE EOD data for a list of symbols.
 
+    Pass a long-lived `client` to reuse its connection pool and warm-up
+    cookies across calls; it is left open. Otherwise a client is created
+    and closed for this call.
+
     Returns:
         {
             "TCS": NSEData(...),
             "INFY": NSEData(...),
         }
     """
-    client = NSEClient()
+    owns_client = client is None
+    client = client or NSEClient()
     results: Dict[str, NSEData] = {}
 
     try:
@@ -135,6 +192,9 @@ async def fetch_eod_data(
                     total_volume=eq["tradeInfo"]["quantitytraded"],
                     delivery_volume=eq["tradeInfo"]["deliveryquantity"],
                     delivery_pct=eq["tradeInfo"]["deliveryToTradedQuantity"],
+                    issued_size=_optional(eq, "securityInfo", "issuedSize"),
+                    free_float_market_cap=_optional(eq, "tradeInfo", "ffmc"),
+                    total_market_cap=_optional(eq, "tradeInfo", "totalMarketCap"),
                 )
 
                 results[symbol] = nse_data
@@ -143,22 +203,28 @@ async def fetch_eod_data(
                 await asyncio.sleep(delay_seconds)
 
             except httpx.HTTPStatusError as e:
+                NSE_FETCH_ERRORS_TOTAL.inc(error_class=f"http_{e.response.status_code}")
                 print(f"⚠️ NSE HTTP error for {symbol}: {e.response.status_code}")
 
             except httpx.RequestError as e:
+                NSE_FETCH_ERRORS_TOTAL.inc(error_class="network")
                 print(f"🌐 Network error for {symbol}: {e}")
 
             except KeyError as e:
+                NSE_FETCH_ERRORS_TOTAL.inc(error_class="schema")
                 print(f"🧩 Schema error for {symbol}: missing {e}")
 
             except ValueError as e:
+                NSE_FETCH_ERRORS_TOTAL.inc(error_class="data")
                 print(f"❌ Data error for {symbol}: {e}")
 
             except Exception as e:
+                NSE_FETCH_ERRORS_TOTAL.inc(error_class="unexpected")
                 print(f"🔥 Unexpected error for {symbol}: {e}")
 
     finally:
-        await client.close()
+        if owns_client:
+            await client.close()
 
     return results
 
@@ -0,0 +1,111 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session, select
+
+from app.analytics.rollups import hit_counts
+from app.db.session import get_session
+from app.models.screener import Screener
+from app.models.symbol import Symbol
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+def _resolve_symbol(session: Session, symbol: str) -> Symbol:
+    sym = session.exec(select(Symbol).where(Symbol.symbol == symbol.upper())).first()
+    if not sym:
+        raise HTTPException(status_code=404, detail=f"Unknown symbol: {symbol}")
+    return sym
+
+
+def _check_range(start: date, end: date) -> None:
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must be on or before 'to'")
+
+
+@router.get("/hits")
+def screener_hits(
+    symbol: str = Query(...),
+    screener_id: int = Query(...),
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    session: Session = Depends(get_session),
+):
+    """Days (and total triggers) on which `symbol` hit `screener_id` in the range."""
+    _check_range(start, end)
+    sym = _resolve_symbol(session, symbol)
+
+    counts = hit_counts(session, start, end, screener_id=screener_id, symbol_id=sym.id)
+    hit_days, trigger_count = counts.get((screener_id, sym.id), (0, 0))
+
+    return {
+        "symbol": sym.symbol,
+        "screener_id": screener_id,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "hit_days": hit_days,
+        "trigger_count": trigger_count,
+    }
+
+
+@router.get("/screeners/top")
+def top_screeners(
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    symbol: str | None = Query(default=None),
+    limit: int = Query(default=10, ge=1, le=100),
+    session: Session = Depends(get_session),
+):
+    """Screeners that fired most in the range, optionally for one symbol."""
+    _check_range(start, end)
+    symbol_id = _resolve_symbol(session, symbol).id if symbol else None
+
+    counts = hit_counts(session, start, end, group_by="screener", symbol_id=symbol_id)
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1][0], -kv[1][1]))[:limit]
+
+    names = {
+        s.id: s.name
+        for s in session.exec(
+            select(Screener).where(Screener.id.in_([key[0] for key, _ in ranked]))
+        ).all()
+    }
+
+    return [
+        {
+            "screener_id": key[0],
+            "name": names.get(key[0]),
+            "hit_days": hit_days,
+            "trigger_count": trigger_count,
+        }
+        for key, (hit_days, trigger_count) in ranked
+    ]
+
+
+@router.get("/symbols/top")
+def top_symbols(
+    screener_id: int = Query(...),
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    limit: int = Query(default=10, ge=1, le=100),
+    session: Session = Depends(get_session),
+):
+    """Symbols that hit `screener_id` on the most days in the range."""
+    _check_range(start, end)
+
+    counts = hit_counts(session, start, end, group_by="symbol", screener_id=screener_id)
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1][0], -kv[1][1]))[:limit]
+
+    symbols = {
+        s.id: s.symbol
+        for s in session.exec(
+            select(Symbol).where(Symbol.id.in_([key[0] for key, _ in ranked]))
+        ).all()
+    }
+
+    return [
+        {
+            "symbol": symbols.get(key[0]),
+            "hit_days": hit_days,
+            "trigger_count": trigger_count,
+        }
+        for key, (hit_days, trigger_count) in ranked
+    ]
@@ -1,7 +1,10 @@
 from datetime import date
+from typing import Literal
 from fastapi import APIRouter, Depends, Query
 from sqlmodel import Session, select
 
+from app.analytics import timeline
+from app.analytics.movers import snapshot_cache
 from app.db.session import get_session
 from app.models.daily_screener_status import DailyScreenerStatus
 from app.models.daily_symbol_snapshot import DailySymbolSnapshot
@@ -94,3 +97,72 @@ def dashboard_view(
         "rows": rows,
     }
 
+
+@router.get("/movers")
+def market_movers(
+    index: str = Query(...),
+    trade_date: date | None = Query(default=None),
+    by: Literal["change_pct", "volume", "delivery_pct"] = Query(default="change_pct"),
+    order: Literal["desc", "asc"] = Query(default="desc"),
+    limit: int = Query(default=10, ge=1, le=50),
+):
+    """
+    Top-N constituents of an index for a day.
+
+    `by=change_pct&order=desc` → gainers, `order=asc` → losers,
+    `by=volume` / `by=delivery_pct` → volume and delivery spikes.
+    Served from a cached columnar snapshot (see app.analytics.movers).
+    """
+    trade_date = trade_date or date.today()
+    snapshot = snapshot_cache.get(index, trade_date)
+
+    return {
+        "index": index,
+        "date": trade_date.isoformat(),
+        "by": by,
+        "order": order,
+        "rows": snapshot.top(by, limit, descending=order == "desc") if snapshot else [],
+    }
+
+
+@router.get("/timeline")
+def trigger_timeline(
+    index: str | None = Query(default=None, description="Index name; omit for all symbols"),
+    trade_date: date | None = Query(default=None),
+    bucket_minutes: int = Query(default=5, ge=5, le=60, multiple_of=5),
+    session: Session = Depends(get_session),
+):
+    """
+    Screener hits per intraday bucket, as parallel arrays:
+    `buckets` holds bucket start times and `series[screener_id]` the hits
+    aligned with them. Today comes from memory, past days from
+    ScreenerTimelineBucket (see app.analytics.timeline).
+    """
+    trade_date = trade_date or date.today()
+
+    index_id = timeline.ALL_SYMBOLS
+    if index is not None:
+        idx = session.exec(select(Index).where(Index.name == index)).first()
+        if not idx:
+            return {"index": index, "date": trade_date.isoformat(), "buckets": [], "series": {}}
+        index_id = idx.id
+
+    if trade_date == date.today():
+        counts = timeline.timeline_ring.counts(trade_date, index_id)
+    else:
+        counts = timeline.load_counts(session, trade_date, index_id)
+
+    buckets, per_screener = timeline.series(counts, bucket_minutes)
+
+    screeners = session.exec(
+        select(Screener).where(Screener.id.in_(list(per_screener)))
+    ).all()
+
+    return {
+        "index": index,
+        "date": trade_date.isoformat(),
+        "bucket_minutes": bucket_minutes,
+        "screeners": [{"id": s.id, "name": s.name} for s in screeners],
+        "buckets": [f"{b // 60:02d}:{b % 60:02d}" for b in buckets],
+        "series": {str(sid): hits for sid, hits in per_screener.items()},
+    }
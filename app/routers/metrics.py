@@ -0,0 +1,37 @@
+"""
+Prometheus scrape endpoint.
+
+Without a writer process this is the whole app. With one (WEB_CONCURRENCY > 1),
+ingestion, NSE and job metrics live in the writer, so its samples are merged in
+under process="writer" and this worker's own under process="api-<pid>". Each
+scrape still reaches a single API worker: HTTP/DB series are per worker, and
+scraping every worker needs one target per worker (e.g. one port each).
+"""
+
+import os
+
+from fastapi import APIRouter, Response
+
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY, process_label
+from app.writer import client as writer_client
+from app.writer.protocol import METRICS
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+def metrics():
+    if not writer_client.enabled():
+        content = REGISTRY.render()
+    else:
+        try:
+            writer_samples = writer_client.call(METRICS)
+        except (EOFError, OSError) as e:
+            print(f"⚠️ Writer metrics unavailable: {e}")
+            writer_samples = None
+        content = REGISTRY.render(process_label(f"api-{os.getpid()}"), merge=writer_samples)
+
+    return Response(
+        content=content,
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
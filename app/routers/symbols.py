@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session, select
+
+from app.analytics.history import downsample, load_history
+from app.db.session import get_session
+from app.models.symbol import Symbol
+from app.search.symbol_index import symbol_index
+
+router = APIRouter(prefix="/symbols", tags=["symbols"])
+
+
+@router.get("/search")
+def search_symbols(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(default=10, ge=1, le=50),
+    index: str | None = Query(default=None, description="Only constituents of this index, e.g. NIFTY50"),
+):
+    # Served entirely from memory; see app.search.symbol_index
+    return symbol_index.search(q, limit=limit, index=index)
+
+
+@router.get("/{symbol}/history")
+def symbol_history(
+    symbol: str,
+    start: date | None = Query(default=None, alias="from", description="Defaults to one year before 'to'"),
+    end: date | None = Query(default=None, alias="to", description="Defaults to today"),
+    points: int | None = Query(default=None, ge=2, le=5000, description="Downsample to at most this many points"),
+    session: Session = Depends(get_session),
+):
+    """
+    Parallel arrays, one entry per trading day (or per bucket when `points`
+    is set). Bit i of `screener_mask` is set when `screeners[i]` fired. Masks
+    stay within 53 bits: past that many screeners only the most frequent get a
+    bit and `screeners_truncated` is true.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must be on or before 'to'")
+
+    sym = session.exec(select(Symbol).where(Symbol.symbol == symbol.upper())).first()
+    if not sym:
+        raise HTTPException(status_code=404, detail=f"Unknown symbol: {symbol}")
+
+    history = load_history(session, sym.id, start, end)
+    days = len(history)
+    if points:
+        history = downsample(history, points)
+
+    return {
+        "symbol": sym.symbol,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "days": days,
+        "downsampled": len(history) < days,
+        "screeners": [
+            {"bit": i, "id": sid, "name": name}
+            for i, (sid, name) in enumerate(history.screeners)
+        ],
+        "dates": [d.isoformat() for d in history.dates],
+        "closes": history.closes,
+        "change_pct": history.change_pct,
+        "volume": history.volume,
+        "screener_mask": history.screener_mask,
+        "screeners_truncated": history.screeners_truncated,
+    }
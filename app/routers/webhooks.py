@@ -1,24 +1,119 @@
 from datetime import date, datetime, timezone
-from fastapi import APIRouter, Depends
+import time
+
+import anyio
+from fastapi import APIRouter, Response
 from sqlmodel import Session, select
 
-from app.db.session import get_session
+from app.analytics import rollups, timeline
+from app.core import admission, cache
+from app.core.admission import AdmissionController, AdmissionLimits
+from app.core.config import settings
+from app.core.metrics import WEBHOOK_PROCESSING_SECONDS, WEBHOOK_SYMBOLS_PER_ALERT
+from app.db.engine import engine
+from app.db.session import write_lock
 from app.models.daily_screener_status import DailyScreenerStatus
 from app.models.screener import Screener
 from app.models.screener_event import ScreenerEvent
 from app.models.symbol import Symbol
 from app.schemas.chartink import ChartinkWebhookPayload
 from app.utils import parse_trigger_time
+from app.writer import client as writer_client
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
+
+def split_stocks(stocks: str) -> list[str]:
+    return [s.strip() for s in stocks.split(",") if s.strip()]
+
+
+# Webhook work runs on its own small thread pool so a flood of alerts can never
+# take the threads that sync read endpoints (dashboard, analytics) are served from.
+_webhook_threads = anyio.CapacityLimiter(settings.WEBHOOK_WORKER_THREADS)
+
+chartink_admission = AdmissionController(
+    "chartink",
+    AdmissionLimits(
+        max_items=settings.WEBHOOK_MAX_SYMBOLS,
+        rate=settings.WEBHOOK_SCREENER_RATE,
+        burst=settings.WEBHOOK_SCREENER_BURST,
+        max_in_flight=settings.WEBHOOK_MAX_IN_FLIGHT,
+        low_priority_queue=settings.WEBHOOK_LOW_PRIORITY_QUEUE,
+        max_keys=settings.WEBHOOK_MAX_SCREENERS,
+    ),
+)
+
+
 @router.post("/chartink")
-def chartink_webhook(
-    payload: ChartinkWebhookPayload,
-    session: Session = Depends(get_session),
-):
+async def chartink_webhook(payload: ChartinkWebhookPayload, response: Response):
+    n_symbols = len(split_stocks(payload.stocks))
+    WEBHOOK_SYMBOLS_PER_ALERT.observe(n_symbols)
+
+    # Raises 429 / 503 when the alert is shed
+    decision = chartink_admission.admit(payload.scan_url, n_symbols)
+
+    if decision == admission.LOW_PRIORITY:
+        chartink_admission.queue_low_priority(lambda: _process_in_chunks(payload))
+        response.status_code = 202
+        return {"status": "queued"}
+
+    try:
+        return await anyio.to_thread.run_sync(
+            _handle_chartink_alert, payload, limiter=_webhook_threads
+        )
+    finally:
+        chartink_admission.release()
+
+
+def _handle_chartink_alert(payload: ChartinkWebhookPayload) -> dict:
+    start = time.perf_counter()
+
+    # Multi-worker mode: the single writer process owns all writes
+    if writer_client.enabled():
+        result = writer_client.call("chartink_alert", payload.model_dump())
+    else:
+        with Session(engine) as session:
+            result = process_chartink_alert(session, payload)
+
+    WEBHOOK_PROCESSING_SECONDS.observe(time.perf_counter() - start)
+    return result
+
+
+def _process_in_chunks(payload: ChartinkWebhookPayload) -> None:
+    """
+    Low-priority path for oversized alerts: WEBHOOK_MAX_SYMBOLS at a time, so
+    the write lock is released between chunks and regular alerts interleave.
+    """
+    symbols = split_stocks(payload.stocks)
+    prices = payload.trigger_prices.split(",") if payload.trigger_prices else None
+    size = settings.WEBHOOK_MAX_SYMBOLS
+
+    for i in range(0, len(symbols), size):
+        chunk = payload.model_copy(
+            update={
+                "stocks": ",".join(symbols[i:i + size]),
+                "trigger_prices": ",".join(prices[i:i + size]) if prices else None,
+            }
+        )
+        _handle_chartink_alert(chunk)
+
+
+def process_chartink_alert(session: Session, payload: ChartinkWebhookPayload) -> dict:
     today = date.today()
 
+    with write_lock:
+        result = _write_chartink_alert(session, payload, today)
+
+    cache.invalidate(cache.SCREENERS, cache.SYMBOLS, cache.SCREENER_STATUS, cache.TIMELINE)
+    return result
+
+
+def _write_chartink_alert(
+    session: Session,
+    payload: ChartinkWebhookPayload,
+    today: date,
+) -> dict:
+
     # 1️⃣ Resolve screener
     screener = session.exec(
         select(Screener).where(Screener.slug == payload.scan_url)
@@ -35,7 +130,7 @@ def chartink_webhook(
         session.refresh(screener)
 
     # 2️⃣ Split stocks & prices
-    symbols = [s.strip() for s in payload.stocks.split(",") if s.strip()]
+    symbols = split_stocks(payload.stocks)
     prices = (
         [float(p) for p in payload.trigger_prices.split(",")]
         if payload.trigger_prices
@@ -43,6 +138,7 @@ def chartink_webhook(
     )
 
     trigger_time = parse_trigger_time(payload.triggered_at)
+    symbol_ids = []
 
     # 3️⃣ Process each symbol
     for symbol_str, price in zip(symbols, prices):
@@ -57,6 +153,8 @@ def chartink_webhook(
             session.commit()
             session.refresh(symbol)
 
+        symbol_ids.append(symbol.id)
+
         # 4️⃣ Insert raw screener event
         event = ScreenerEvent(
             screener_id=screener.id,
@@ -78,6 +176,7 @@ def chartink_webhook(
         ).first()
 
         now = datetime.now(timezone.utc)
+        new_day = status is None
 
         if status:
             status.trigger_count += 1
@@ -92,6 +191,25 @@ def chartink_webhook(
             )
             session.add(status)
 
-    session.commit()
+        # 6️⃣ Week / month hit rollups (same transaction)
+        rollups.bump(
+            session,
+            screener_id=screener.id,
+            symbol_id=symbol.id,
+            trade_date=today,
+            new_day=new_day,
+        )
+
+    # 7️⃣ Intraday timeline buckets (same transaction)
+    increments = timeline.bump(
+        session,
+        trade_date=today,
+        screener_id=screener.id,
+        symbol_ids=symbol_ids,
+        trigger_time=trigger_time,
+    )
+
+    with timeline.timeline_ring.committing(today, increments):
+        session.commit()
 
     return {"status": "ok"}
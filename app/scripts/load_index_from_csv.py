@@ -1,11 +1,19 @@
 import argparse
 import csv
+import re
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, List
 
+from sqlalchemy import delete, insert, update
 from sqlmodel import Session, select
 
+from app.core import cache
+from app.core.config import settings
 from app.db.engine import engine
+from app.db.profiler import profile_queries
+from app.db.session import write_lock
 from app.models.symbol import Symbol
 from app.models.index import Index
 from app.models.index_constituent import IndexConstituent
@@ -16,6 +24,37 @@ from app.models.index_constituent import IndexConstituent
 # =====================================================================================#
 
 REQUIRED_COLUMNS = {"Symbol", "Company Name"}
+WEIGHTAGE_COLUMNS = ("Weightage", "Weightage(%)", "Weight")
+
+RESOURCES_DIR = Path(__file__).resolve().parents[2] / "resources"
+# NSE archive naming: ind_nifty50list.csv, ind_niftybanklist.csv, ...
+INDEX_CSV_PATTERN = re.compile(r"^ind_(?P<name>[a-z0-9_]+?)list\.csv$", re.IGNORECASE)
+
+# SQLite caps bound parameters per statement; stay well below it.
+IN_CHUNK_SIZE = 900
+
+
+@dataclass
+class IndexSource:
+    name: str
+    csv_path: Path
+    description: str | None = None
+
+
+@dataclass
+class IndexSyncResult:
+    name: str
+    created: bool = False
+    added: int = 0
+    removed: int = 0
+    reweighted: int = 0
+
+
+@dataclass
+class SyncReport:
+    symbols_added: int = 0
+    symbols_renamed: int = 0
+    indices: List[IndexSyncResult] = field(default_factory=list)
 
 
 def parse_csv(path: Path) -> Dict[str, dict]:
@@ -23,17 +62,21 @@ def parse_csv(path: Path) -> Dict[str, dict]:
     Returns:
         {
           SYMBOL: {
-            "name": Company Name
+            "name": Company Name,
+            "weightage": float | None   # only if the CSV has a weightage column
           }
         }
     """
     with path.open(newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
 
-        missing = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+        fieldnames = set(reader.fieldnames or [])
+        missing = REQUIRED_COLUMNS - fieldnames
         if missing:
             raise ValueError(f"CSV missing required columns: {missing}")
 
+        weightage_column = next((c for c in WEIGHTAGE_COLUMNS if c in fieldnames), None)
+
         rows = {}
         for row in reader:
             symbol = row["Symbol"].strip().upper()
@@ -47,8 +90,13 @@ def parse_csv(path: Path) -> Dict[str, dict]:
             if not company_name:
                 raise ValueError(f"Missing Company Name for symbol {symbol}")
 
+            weightage = None
+            if weightage_column and (row[weightage_column] or "").strip():
+                weightage = float(row[weightage_column])
+
             rows[symbol] = {
-                "name": company_name
+                "name": company_name,
+                "weightage": weightage,
             }
 
         if not rows:
@@ -57,85 +105,234 @@ def parse_csv(path: Path) -> Dict[str, dict]:
         return rows
 
 
-def main(index_name: str, description: str, csv_path: Path):
-    data = parse_csv(csv_path)
+def discover_index_csvs(directory: Path = RESOURCES_DIR) -> List[IndexSource]:
+    """Every ind_<name>list.csv in `directory`, e.g. ind_nifty50list.csv → NIFTY50."""
+    sources = []
+    for path in sorted(directory.glob("*.csv")):
+        match = INDEX_CSV_PATTERN.match(path.name)
+        if match:
+            sources.append(IndexSource(name=match["name"].upper(), csv_path=path))
+    return sources
 
-    with Session(engine) as session:
-        # 1️⃣ Upsert Index
-        index = session.exec(
-            select(Index).where(Index.name == index_name)
-        ).first()
 
-        if not index:
-            index = Index(name=index_name, description=description)
-            session.add(index)
-            session.commit()
-            session.refresh(index)
-            print(f"✅ Created index: {index_name}")
+def _chunks(items: List, size: int = IN_CHUNK_SIZE) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _resolve_symbols(session: Session, wanted: Dict[str, str], report: SyncReport) -> Dict[str, int]:
+    """
+    Map every wanted symbol to its id, bulk-inserting the missing ones.
+
+    `wanted` is {SYMBOL: company name}. Placeholder names left by the
+    webhook (name == symbol) are replaced with the CSV company name.
+    """
+    def fetch(symbols: List[str]) -> Dict[str, tuple]:
+        found = {}
+        for chunk in _chunks(symbols):
+            for sym_id, sym, name in session.exec(
+                select(Symbol.id, Symbol.symbol, Symbol.name).where(Symbol.symbol.in_(chunk))
+            ):
+                found[sym] = (sym_id, name)
+        return found
+
+    existing = fetch(list(wanted))
+
+    missing = [sym for sym in wanted if sym not in existing]
+    if missing:
+        session.execute(
+            insert(Symbol),
+            [{"symbol": sym, "name": wanted[sym], "exchange": "NSE"} for sym in missing],
+        )
+        existing.update(fetch(missing))
+        report.symbols_added += len(missing)
+
+    renames = [
+        {"id": sym_id, "name": wanted[sym]}
+        for sym, (sym_id, name) in existing.items()
+        if name == sym and wanted[sym] != sym
+    ]
+    if renames:
+        session.execute(update(Symbol), renames)
+        report.symbols_renamed += len(renames)
+
+    return {sym: sym_id for sym, (sym_id, _) in existing.items()}
+
+
+def _sync_constituents(
+    session: Session,
+    index_id: int,
+    data: Dict[str, dict],
+    symbol_ids: Dict[str, int],
+    result: IndexSyncResult,
+) -> None:
+    existing = session.exec(
+        select(IndexConstituent).where(IndexConstituent.index_id == index_id)
+    ).all()
+
+    current: Dict[int, IndexConstituent] = {}
+    stale_ids: List[int] = []
+    for ic in existing:
+        # Duplicate rows for the same symbol are collapsed to one.
+        if ic.symbol_id in current:
+            stale_ids.append(ic.id)
         else:
-            if index.description != description:
-                index.description = description
-                session.add(index)
-                session.commit()
-                print(f"🔄 Updated description for index: {index_name}")
-
-        # 2️⃣ Resolve Symbols
-        symbols: Dict[str, Symbol] = {}
+            current[ic.symbol_id] = ic
+
+    wanted = {symbol_ids[sym]: meta for sym, meta in data.items()}
+
+    inserts = [
+        {"index_id": index_id, "symbol_id": sid, "weightage": meta["weightage"]}
+        for sid, meta in wanted.items()
+        if sid not in current
+    ]
+    removed = [ic.id for sid, ic in current.items() if sid not in wanted]
+    # A CSV without weightages leaves existing (computed) weightages alone.
+    reweights = [
+        {"id": ic.id, "weightage": wanted[sid]["weightage"]}
+        for sid, ic in current.items()
+        if sid in wanted
+        and wanted[sid]["weightage"] is not None
+        and wanted[sid]["weightage"] != ic.weightage
+    ]
+
+    for chunk in _chunks(removed + stale_ids):
+        session.execute(delete(IndexConstituent).where(IndexConstituent.id.in_(chunk)))
+    if inserts:
+        session.execute(insert(IndexConstituent), inserts)
+    if reweights:
+        session.execute(update(IndexConstituent), reweights)
+
+    result.added = len(inserts)
+    result.removed = len(removed)
+    result.reweighted = len(reweights)
+
+
+def sync_indices(session: Session, sources: List[IndexSource]) -> SyncReport:
+    """
+    Bring index membership in line with the given CSVs in one transaction.
+
+    Symbols are resolved once for all indices; each index then gets a set
+    diff against its current constituents (insert / delete / reweight).
+    """
+    report = SyncReport()
+    parsed = [(source, parse_csv(source.csv_path)) for source in sources]
+
+    # 1️⃣ Resolve symbols across every CSV at once
+    wanted: Dict[str, str] = {}
+    for _, data in parsed:
         for sym, meta in data.items():
-            symbol = session.exec(
-                select(Symbol).where(Symbol.symbol == sym)
-            ).first()
+            wanted.setdefault(sym, meta["name"])
+    symbol_ids = _resolve_symbols(session, wanted, report)
 
-            if not symbol:
-                symbol = Symbol(
-                    symbol=sym,
-                    name=meta["name"],
-                )
-                session.add(symbol)
-                session.commit()
-                session.refresh(symbol)
-                print(f"➕ Added symbol: {sym}")
-
-            symbols[sym] = symbol
-
-        # 3️⃣ Fetch existing constituents for this index
-        existing = session.exec(
-            select(IndexConstituent)
-            .where(IndexConstituent.index_id == index.id)
-        ).all()
-
-        existing_symbol_ids = {ic.symbol_id for ic in existing}
-
-        # 4️⃣ Insert missing index constituents (weightage = NULL)
-        for sym, symbol in symbols.items():
-            if symbol.id not in existing_symbol_ids:
-                ic = IndexConstituent(
-                    index_id=index.id,
-                    symbol_id=symbol.id,
-                    weightage=None,  # 👈 explicitly NULL
-                )
-                session.add(ic)
-                print(f"➕ Added constituent: {sym}")
-
-        session.commit()
-        print("✅ Index membership load complete (weightage = NULL)")
+    # 2️⃣ Upsert indices
+    names = [source.name for source, _ in parsed]
+    indices = {
+        idx.name: idx
+        for idx in session.exec(select(Index).where(Index.name.in_(names))).all()
+    }
+
+    for source, data in parsed:
+        result = IndexSyncResult(name=source.name)
+        index = indices.get(source.name)
+
+        if not index:
+            index = Index(
+                name=source.name,
+                description=source.description or f"{source.name} Index",
+            )
+            session.add(index)
+            session.flush()
+            indices[source.name] = index
+            result.created = True
+        elif source.description and index.description != source.description:
+            index.description = source.description
+            session.add(index)
+
+        # 3️⃣ Diff constituents
+        _sync_constituents(session, index.id, data, symbol_ids, result)
+        report.indices.append(result)
+
+    session.commit()
+    return report
+
+
+def print_report(report: SyncReport) -> None:
+    print(f"➕ Symbols added: {report.symbols_added}, renamed: {report.symbols_renamed}")
+    for r in report.indices:
+        status = "✅ Created" if r.created else "🔄 Synced"
+        print(
+            f"{status} {r.name}: +{r.added} / -{r.removed} constituents, "
+            f"{r.reweighted} weightages updated"
+        )
+
+
+def run_sync(sources: List[IndexSource]) -> SyncReport:
+    with write_lock, Session(engine) as session:
+        report = sync_indices(session, sources)
+
+    cache.invalidate(cache.INDICES, cache.SYMBOLS)
+    print_report(report)
+    return report
+
+
+def main(index_name: str, description: str, csv_path: Path) -> SyncReport:
+    return run_sync(
+        [IndexSource(name=index_name, csv_path=csv_path, description=description)]
+    )
+
+
+def main_all(directory: Path = RESOURCES_DIR) -> SyncReport:
+    sources = discover_index_csvs(directory)
+    if not sources:
+        raise ValueError(f"No ind_<name>list.csv files in {directory}")
+
+    return run_sync(sources)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description="Load index symbols from CSV (weightage set to NULL)"
+        description="Sync index membership from CSV (single index, or every CSV in a directory)"
+    )
+    parser.add_argument("--index", help="Index name (e.g. NIFTY50)")
+    parser.add_argument("--description", help="Index description")
+    parser.add_argument("--csv", type=Path, help="Path to CSV file")
+    parser.add_argument(
+        "--all",
+        nargs="?",
+        const=RESOURCES_DIR,
+        type=Path,
+        metavar="DIR",
+        help="Sync every ind_<name>list.csv in DIR (default: resources/)",
+    )
+    parser.add_argument(
+        "--profile-queries",
+        action="store_true",
+        help="Print a SQL profile with N+1 detection (also QUERY_PROFILING=true)",
     )
-    parser.add_argument("--index", required=True, help="Index name (e.g. NIFTY50)")
-    parser.add_argument("--description", required=True, help="Index description")
-    parser.add_argument("--csv", required=True, type=Path, help="Path to CSV file")
 
     args = parser.parse_args()
 
-    main(
-        index_name=args.index,
-        description=args.description,
-        csv_path=args.csv,
-    )
+    if not args.all and not (args.index and args.csv):
+        parser.error("either --all or both --index and --csv are required")
+
+    profiling = args.profile_queries or settings.QUERY_PROFILING
+    with (
+        profile_queries(
+            "load_index_from_csv",
+            n_plus_one_threshold=settings.QUERY_PROFILE_N_PLUS_ONE_THRESHOLD,
+        )
+        if profiling
+        else nullcontext()
+    ):
+        if args.all:
+            main_all(args.all)
+        else:
+            main(
+                index_name=args.index,
+                description=args.description,
+                csv_path=args.csv,
+            )
 
 
 # === STANDALONE SCRIPT USAGE ====
@@ -144,3 +341,5 @@ if __name__ == "__main__":
 #   --index NIFTY50 \
 #   --description "NIFTY 50 Index" \
 #   --csv ./resources/ind_nifty50list.csv
+#
+# uv run python app/scripts/load_index_from_csv.py --all   # every CSV in resources/
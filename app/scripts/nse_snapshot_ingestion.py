@@ -1,15 +1,42 @@
 import asyncio
+from contextlib import nullcontext
 from datetime import date
-from typing import Iterable
+import time
+from typing import TYPE_CHECKING, Dict, Iterable
 
 from sqlmodel import Session, select
 
+from app.analytics import weightage
+from app.core import cache
+from app.core.config import settings
+from app.core.metrics import record_ingestion
 from app.db.engine import engine
+from app.db.profiler import profile_queries
+from app.db.session import write_lock
 from app.models.daily_symbol_snapshot import DailySymbolSnapshot
 from app.models.symbol import Symbol
-from app.nse.nse import fetch_eod_data
 from app.utils import time_async
 
+if TYPE_CHECKING:
+    from app.nse.nse import NSEClient
+
+
+MARKET_CAP_FIELDS = ("issued_size", "free_float_market_cap", "total_market_cap")
+
+
+def _extra_data(nse_data) -> dict:
+    extra = {
+        "year_high": nse_data.year_high,
+        "year_low": nse_data.year_low,
+        "delivery_volume": nse_data.delivery_volume,
+        "delivery_pct": nse_data.delivery_pct,
+    }
+    # Weightage inputs (app.analytics.weightage), only when NSE sent them
+    for field in MARKET_CAP_FIELDS:
+        value = getattr(nse_data, field, None)
+        if value is not None:
+            extra[field] = value
+    return extra
 
 
 def _upsert_snapshot(
@@ -30,12 +57,7 @@ def _upsert_snapshot(
         snapshot.close_price = nse_data.close
         snapshot.change_pct = nse_data.day_change_pct
         snapshot.volume = int(nse_data.total_volume)
-        snapshot.extra_data = {
-            "year_high": nse_data.year_high,
-            "year_low": nse_data.year_low,
-            "delivery_volume": nse_data.delivery_volume,
-            "delivery_pct": nse_data.delivery_pct,
-        }
+        snapshot.extra_data = _extra_data(nse_data)
     else:
         snapshot = DailySymbolSnapshot(
             symbol_id=symbol_id,
@@ -43,12 +65,7 @@ def _upsert_snapshot(
             close_price=nse_data.close,
             change_pct=nse_data.day_change_pct,
             volume=int(nse_data.total_volume),
-            extra_data={
-                "year_high": nse_data.year_high,
-                "year_low": nse_data.year_low,
-                "delivery_volume": nse_data.delivery_volume,
-                "delivery_pct": nse_data.delivery_pct,
-            },
+            extra_data=_extra_data(nse_data),
         )
         session.add(snapshot)
 
@@ -58,54 +75,88 @@ async def ingest_nse_eod_snapshots(
     *,
     trade_date: date | None = None,
     symbols: Iterable[str] | None = None,
+    client: "NSEClient | None" = None,
 ) -> None:
     """
     Fetch NSE EOD data and upsert DailySymbolSnapshot rows.
 
     - If symbols is None → fetch all symbols from DB
     - trade_date defaults to today
+    - client: optional warm NSEClient to reuse (e.g. from the scheduler)
     """
+    start = time.perf_counter()
     trade_date = trade_date or date.today()
 
-    with Session(engine) as session:
-        # 1️⃣ Resolve symbols
-        if symbols is None:
-            db_symbols = session.exec(select(Symbol)).all()
-            symbol_map = {s.symbol: s for s in db_symbols}
-        else:
-            db_symbols = session.exec(
-                select(Symbol).where(Symbol.symbol.in_(symbols))
-            ).all()
-            symbol_map = {s.symbol: s for s in db_symbols}
+    # DB work is synchronous (and the write phase takes write_lock), so it
+    # runs in a thread: the scheduler may be sharing the API's event loop.
+    symbol_map = await asyncio.to_thread(_load_symbol_ids, symbols)
 
     if not symbol_map:
         print("⚠️ No symbols found for NSE ingestion")
         return
 
-    # 2️⃣ Fetch NSE data
-    nse_results = await fetch_eod_data(list(symbol_map.keys()))
+    # 2️⃣ Fetch NSE data (httpx is only imported once there is work to do)
+    from app.nse.nse import fetch_eod_data
+
+    nse_results = await fetch_eod_data(list(symbol_map.keys()), client=client)
 
     if not nse_results:
         print("⚠️ NSE returned no data")
         return
 
-    # 3️⃣ Upsert snapshots
+    reweighted = await asyncio.to_thread(
+        _write_snapshots, trade_date, symbol_map, nse_results
+    )
+
+    record_ingestion("nse_eod", len(nse_results), time.perf_counter() - start)
+    print(
+        f"✅ NSE EOD snapshots ingested for {len(nse_results)} symbols, "
+        f"{reweighted} index weightages updated"
+    )
+
+
+def _load_symbol_ids(symbols: Iterable[str] | None) -> Dict[str, int]:
+    # 1️⃣ Resolve symbols
     with Session(engine) as session:
+        query = select(Symbol.symbol, Symbol.id)
+        if symbols is not None:
+            query = query.where(Symbol.symbol.in_(list(symbols)))
+        return {symbol: symbol_id for symbol, symbol_id in session.exec(query)}
+
+
+def _write_snapshots(trade_date: date, symbol_map: Dict[str, int], nse_results: dict) -> int:
+    # 3️⃣ Upsert snapshots
+    with write_lock, Session(engine) as session:
         for symbol, nse_data in nse_results.items():
-            db_symbol = symbol_map.get(symbol)
-            if not db_symbol:
+            symbol_id = symbol_map.get(symbol)
+            if not symbol_id:
                 continue  # should not happen, but safe
 
             _upsert_snapshot(
                 session,
-                symbol_id=db_symbol.id,
+                symbol_id=symbol_id,
                 trade_date=trade_date,
                 nse_data=nse_data,
             )
 
+        # 4️⃣ Index weightages from the day's market caps
+        reweighted = weightage.refresh_weightages(session, trade_date)
+
         session.commit()
 
-    print(f"✅ NSE EOD snapshots ingested for {len(nse_results)} symbols")
+    cache.invalidate(cache.SNAPSHOTS)
+    if reweighted:
+        cache.invalidate(cache.INDICES)
+    return reweighted
 
 if __name__ == "__main__":
-    asyncio.run(ingest_nse_eod_snapshots())
\ No newline at end of file
+    # QUERY_PROFILING=true prints a SQL profile with N+1 detection
+    with (
+        profile_queries(
+            "nse_snapshot_ingestion",
+            n_plus_one_threshold=settings.QUERY_PROFILE_N_PLUS_ONE_THRESHOLD,
+        )
+        if settings.QUERY_PROFILING
+        else nullcontext()
+    ):
+        asyncio.run(ingest_nse_eod_snapshots())
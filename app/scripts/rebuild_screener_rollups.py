@@ -0,0 +1,32 @@
+import time
+
+from sqlmodel import Session
+
+from app.analytics import rollups, timeline
+from app.db.engine import engine
+from app.db.session import write_lock
+
+# =====================================================================================#
+# THIS IS A STANDALONE SCRIPT THAT WILL BE TRIGGERED MANUALLY (e.g. after a backfill)  #
+# NOT A PART OF FASTAPI                                                                #
+# =====================================================================================#
+
+
+def main() -> None:
+    start = time.perf_counter()
+    with write_lock, Session(engine) as session:
+        rollup_rows = rollups.rebuild(session)
+        timeline_rows = timeline.rebuild(session)
+    print(
+        f"✅ Rebuilt {rollup_rows} hit rollup rows and {timeline_rows} timeline buckets "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
+
+
+# === STANDALONE SCRIPT USAGE ====
+
+# uv run python -m app.scripts.rebuild_screener_rollups
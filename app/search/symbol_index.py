@@ -0,0 +1,294 @@
+"""
+In-memory autocomplete over Symbol.symbol and Symbol.name.
+
+Prefix matches come from sorted key arrays (bisect → O(log n + k)); fuzzy/substring
+matches from a trigram posting list. Snapshots are immutable and swapped atomically,
+so searches never take a lock or touch the database.
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from sqlmodel import Session, select
+
+from app.core import cache
+from app.db.engine import engine
+from app.models.index import Index
+from app.models.index_constituent import IndexConstituent
+from app.models.symbol import Symbol
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+EXACT_SCORE = 100.0
+SYMBOL_PREFIX_SCORE = 80.0
+NAME_PREFIX_SCORE = 60.0
+TRIGRAM_SCORE = 40.0
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+# Safety net for writes made by other processes: pick up new symbols after
+# REFRESH_SECONDS, and renames / index membership after REBUILD_SECONDS.
+REFRESH_SECONDS = 30.0
+REBUILD_SECONDS = 600.0
+
+
+def compact(value: str) -> str:
+    """Uppercase and drop punctuation/spaces: 'Bajaj-Auto Ltd.' → 'BAJAJAUTOLTD'."""
+    return _NON_ALNUM.sub("", value.upper())
+
+
+def words(value: str) -> List[str]:
+    return [w for w in _NON_ALNUM.split(value.upper()) if w]
+
+
+def trigrams(value: str) -> FrozenSet[str]:
+    padded = f"  {value} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class SymbolEntry:
+    id: int
+    symbol: str
+    name: str
+
+
+@dataclass
+class _Snapshot:
+    entries: Dict[int, SymbolEntry] = field(default_factory=dict)
+    symbol_keys: List[str] = field(default_factory=list)
+    symbol_ids: List[int] = field(default_factory=list)
+    name_keys: List[str] = field(default_factory=list)
+    name_ids: List[int] = field(default_factory=list)
+    trigram_postings: Dict[str, Tuple[int, ...]] = field(default_factory=dict)
+    members: Dict[str, FrozenSet[int]] = field(default_factory=dict)
+    max_id: int = 0
+    built_at: float = 0.0  # last full rebuild (monotonic)
+    refreshed_at: float = 0.0  # last check for new symbols
+
+
+def _name_keys(e: SymbolEntry) -> Set[str]:
+    # Every word of the name, plus the whole compacted name
+    return {*words(e.name), compact(e.name)}
+
+
+def _entry_trigrams(e: SymbolEntry) -> FrozenSet[str]:
+    return trigrams(compact(e.symbol)) | trigrams(compact(e.name))
+
+
+def _build_snapshot(entries: Dict[int, SymbolEntry], members: Dict[str, FrozenSet[int]]) -> _Snapshot:
+    symbol_pairs = sorted((compact(e.symbol), e.id) for e in entries.values())
+    name_pairs = sorted((k, e.id) for e in entries.values() for k in _name_keys(e))
+
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for e in entries.values():
+        for g in _entry_trigrams(e):
+            postings[g].append(e.id)
+
+    return _Snapshot(
+        entries=entries,
+        symbol_keys=[k for k, _ in symbol_pairs],
+        symbol_ids=[i for _, i in symbol_pairs],
+        name_keys=[k for k, _ in name_pairs],
+        name_ids=[i for _, i in name_pairs],
+        trigram_postings={g: tuple(ids) for g, ids in postings.items()},
+        members=members,
+        max_id=max(entries, default=0),
+        built_at=time.monotonic(),
+        refreshed_at=time.monotonic(),
+    )
+
+
+def _insort_pair(keys: List[str], ids: List[int], key: str, symbol_id: int) -> None:
+    i = bisect.bisect_right(keys, key)
+    # Same order as sorting (key, id) pairs
+    while i > 0 and keys[i - 1] == key and ids[i - 1] > symbol_id:
+        i -= 1
+    keys.insert(i, key)
+    ids.insert(i, symbol_id)
+
+
+def _with_new_entries(snap: _Snapshot, new: List[SymbolEntry]) -> _Snapshot:
+    """
+    Copy of `snap` with `new` entries added: keys are bisect-inserted into
+    copies of the sorted arrays and only the new entries' trigram postings
+    are touched, instead of re-sorting and re-indexing everything.
+    """
+    entries = dict(snap.entries)
+    symbol_keys, symbol_ids = list(snap.symbol_keys), list(snap.symbol_ids)
+    name_keys, name_ids = list(snap.name_keys), list(snap.name_ids)
+    postings = dict(snap.trigram_postings)
+
+    for e in new:
+        entries[e.id] = e
+        _insort_pair(symbol_keys, symbol_ids, compact(e.symbol), e.id)
+        for k in _name_keys(e):
+            _insort_pair(name_keys, name_ids, k, e.id)
+        for g in _entry_trigrams(e):
+            postings[g] = postings.get(g, ()) + (e.id,)
+
+    return _Snapshot(
+        entries=entries,
+        symbol_keys=symbol_keys,
+        symbol_ids=symbol_ids,
+        name_keys=name_keys,
+        name_ids=name_ids,
+        trigram_postings=postings,
+        members=snap.members,
+        max_id=max(snap.max_id, *(e.id for e in new)),
+        built_at=snap.built_at,
+        refreshed_at=time.monotonic(),
+    )
+
+
+def _prefix_ids(keys: List[str], ids: List[int], prefix: str):
+    i = bisect.bisect_left(keys, prefix)
+    while i < len(keys) and keys[i].startswith(prefix):
+        yield keys[i], ids[i]
+        i += 1
+
+
+class SymbolSearchIndex:
+    def __init__(self):
+        self._snapshot = _Snapshot()
+        self._lock = threading.Lock()
+        self._installed = False
+        self._refreshing = False
+
+    def __len__(self) -> int:
+        return len(self._snapshot.entries)
+
+    # --- maintenance ---
+
+    def _load_members(self, session: Session) -> Dict[str, FrozenSet[int]]:
+        members: Dict[str, set] = defaultdict(set)
+        for index_name, symbol_id in session.exec(
+            select(Index.name, IndexConstituent.symbol_id)
+            .where(IndexConstituent.index_id == Index.id)
+        ):
+            members[index_name].add(symbol_id)
+        return {name: frozenset(ids) for name, ids in members.items()}
+
+    def rebuild(self) -> None:
+        """Full reload of symbols and index membership (startup, index syncs)."""
+        with self._lock, Session(engine) as session:
+            entries = {
+                sid: SymbolEntry(sid, sym, name)
+                for sid, sym, name in session.exec(select(Symbol.id, Symbol.symbol, Symbol.name))
+            }
+            self._snapshot = _build_snapshot(entries, self._load_members(session))
+
+    def refresh_new_symbols(self) -> None:
+        """Incremental: pull only symbols inserted since the last load."""
+        with self._lock, Session(engine) as session:
+            current = self._snapshot
+            new_rows = session.exec(
+                select(Symbol.id, Symbol.symbol, Symbol.name).where(Symbol.id > current.max_id)
+            ).all()
+            if not new_rows:
+                current.refreshed_at = time.monotonic()
+                return
+
+            self._snapshot = _with_new_entries(
+                current, [SymbolEntry(sid, sym, name) for sid, sym, name in new_rows]
+            )
+
+    def install(self) -> None:
+        """Build now and keep in sync with writes via the cache invalidation bus."""
+        self.rebuild()
+        cache.on_invalidate(cache.SYMBOLS, self.refresh_new_symbols)
+        cache.on_invalidate(cache.INDICES, self.rebuild)
+        self._installed = True
+
+    def _maybe_refresh(self) -> None:
+        """
+        Safety net for writes whose invalidation never reaches this process
+        (e.g. the CSV loader run as a standalone script): a stale snapshot is
+        refreshed on a background thread while searches keep using it.
+        """
+        snap = self._snapshot
+        age = time.monotonic() - snap.refreshed_at
+        if not self._installed or self._refreshing or age < REFRESH_SECONDS:
+            return
+
+        self._refreshing = True
+        full = time.monotonic() - snap.built_at >= REBUILD_SECONDS
+        threading.Thread(
+            target=self._background_refresh, args=(full,), name="symbol-index-refresh", daemon=True
+        ).start()
+
+    def _background_refresh(self, full: bool) -> None:
+        try:
+            if full:
+                self.rebuild()
+            else:
+                self.refresh_new_symbols()
+        except Exception as e:
+            print(f"⚠️ Symbol index refresh failed: {e}")
+        finally:
+            self._refreshing = False
+
+    # --- queries ---
+
+    def search(self, query: str, *, limit: int = 10, index: str | None = None) -> List[dict]:
+        self._maybe_refresh()
+        snap = self._snapshot
+        q = compact(query)
+        if not q:
+            return []
+
+        allowed = None
+        if index is not None:
+            allowed = snap.members.get(index)
+            if not allowed:
+                return []
+
+        scores: Dict[int, float] = {}
+
+        def offer(symbol_id: int, score: float) -> None:
+            if allowed is not None and symbol_id not in allowed:
+                return
+            if score > scores.get(symbol_id, 0.0):
+                scores[symbol_id] = score
+
+        for key, sid in _prefix_ids(snap.symbol_keys, snap.symbol_ids, q):
+            if key == q:
+                offer(sid, EXACT_SCORE)
+            else:
+                # Shorter completions first: "TCS" before "TCSLTDDVR" for "TC"
+                offer(sid, SYMBOL_PREFIX_SCORE - min(len(key) - len(q), 10) * 0.5)
+
+        for key, sid in _prefix_ids(snap.name_keys, snap.name_ids, q):
+            offer(sid, NAME_PREFIX_SCORE - min(len(key) - len(q), 10) * 0.5)
+
+        if len(scores) < limit and len(q) >= 3:
+            q_grams = trigrams(q)
+            shared: Dict[int, int] = defaultdict(int)
+            for g in q_grams:
+                for sid in snap.trigram_postings.get(g, ()):
+                    shared[sid] += 1
+            for sid, n in shared.items():
+                similarity = n / len(q_grams)
+                if similarity >= MIN_TRIGRAM_SIMILARITY:
+                    offer(sid, TRIGRAM_SCORE * similarity)
+
+        ranked = heapq.nsmallest(
+            limit, scores.items(), key=lambda kv: (-kv[1], snap.entries[kv[0]].symbol)
+        )
+        return [
+            {
+                "id": sid,
+                "symbol": snap.entries[sid].symbol,
+                "name": snap.entries[sid].name,
+                "score": round(score, 2),
+            }
+            for sid, score in ranked
+        ]
+
+
+symbol_index = SymbolSearchIndex()
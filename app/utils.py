@@ -1,46 +1,62 @@
 from datetime import datetime 
 import functools
+import inspect
 import json
 from pathlib import Path
 import time
-from typing import Any, Awaitable, Callable, Dict, TypeVar, Union
+from typing import Any, Callable, Dict, TypeVar, Union
 
-import aiofiles
+from app.core.metrics import TIMED_SECONDS
 
 
 T = TypeVar("T")
 
-def time_async(
+def timed(
     label: str | None = None
-) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
-    Decorator to time async functions.
+    Decorator to time sync or async functions.
+
+    Durations are recorded in the `profitabull_timed_seconds` histogram
+    (label = `label` or the function name) and exposed on /metrics.
 
     Usage:
-        @time_async()
-        async def foo(): ...
+        @timed()
+        def foo(): ...
 
-        @time_async("NSE EOD ingestion")
+        @timed("NSE EOD ingestion")
         async def bar(): ...
     """
 
-    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
         name = label or func.__name__
 
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    TIMED_SECONDS.observe(time.perf_counter() - start, label=name)
+
+            return async_wrapper
+
         @functools.wraps(func)
-        async def wrapper(*args, **kwargs) -> T:
+        def wrapper(*args, **kwargs):
             start = time.perf_counter()
             try:
-                return await func(*args, **kwargs)
+                return func(*args, **kwargs)
             finally:
-                end = time.perf_counter()
-                elapsed = end - start
-                print(f"⏱️ {name} took {elapsed:.2f}s")
+                TIMED_SECONDS.observe(time.perf_counter() - start, label=name)
 
         return wrapper
 
     return decorator
 
+# Backwards-compatible name; `timed` handles coroutines too.
+time_async = timed
+
 def parse_trigger_time(value: str | None) -> Union[datetime.time,None]  :
     if not value:
         return None
@@ -51,6 +67,8 @@ def parse_trigger_time(value: str | None) -> Union[datetime.time,None]  :
         return None
 
 async def write_json_async(path: Path, data: Dict[str, Any]) -> None:
+    import aiofiles  # deferred: only file-writing scripts need it
+
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(".tmp")
 
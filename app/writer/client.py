@@ -0,0 +1,102 @@
+"""API-worker side of the writer IPC. Enabled when WRITER_ADDRESS is set."""
+
+import queue
+import threading
+import time
+from multiprocessing.connection import Client, Connection
+from typing import Any
+
+from app.core import cache
+from app.core.config import settings
+from app.writer.protocol import SUBSCRIBE, WriterError, authkey, parse_address
+
+_POOL_SIZE = 8
+_pool: "queue.LifoQueue[Connection]" = queue.LifoQueue(maxsize=_POOL_SIZE)
+
+
+def enabled() -> bool:
+    return settings.WRITER_ADDRESS is not None
+
+
+def _connect() -> Connection:
+    return Client(
+        parse_address(settings.WRITER_ADDRESS),
+        authkey=authkey(),
+    )
+
+
+def call(op: str, args: dict | None = None, *, retries: int = 1) -> Any:
+    """
+    Run a writer command and wait for its result.
+
+    Connections are pooled per worker. Only failures before the request is
+    sent (connect errors, a stale pooled connection) are retried: once the
+    writer may have received it, a lost reply is raised rather than risking
+    applying the command twice.
+    """
+    message = {"op": op, "args": args or {}}
+
+    for attempt in range(retries + 1):
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            conn = None
+
+        try:
+            conn = conn or _connect()
+            conn.send(message)
+        except (EOFError, OSError):
+            if conn is not None:
+                conn.close()
+            if attempt >= retries:
+                raise
+            continue
+
+        try:
+            reply = conn.recv()
+        except (EOFError, OSError):
+            conn.close()
+            raise
+
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+        if not reply["ok"]:
+            raise WriterError(reply["error"])
+        return reply["result"]
+
+
+def _subscribe_forever(stop: threading.Event) -> None:
+    backoff = 0.1
+    while not stop.is_set():
+        conn = None
+        try:
+            conn = _connect()
+            conn.send({"op": SUBSCRIBE})
+            # Events may have been missed while disconnected.
+            cache.invalidate_local(cache.ALL_TOPICS)
+            backoff = 0.1
+            while not stop.is_set():
+                if conn.poll(0.5):
+                    event = conn.recv()
+                    cache.invalidate_local(event["invalidate"])
+        except (EOFError, OSError):
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 5.0)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_subscriber() -> threading.Event:
+    """Apply the writer's invalidation broadcasts locally. Set the event to stop."""
+    stop = threading.Event()
+    threading.Thread(
+        target=_subscribe_forever,
+        args=(stop,),
+        name="writer-subscriber",
+        daemon=True,
+    ).start()
+    return stop
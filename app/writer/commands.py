@@ -0,0 +1,36 @@
+"""
+Commands the writer process executes on behalf of API workers.
+Each gets a fresh Session and the raw args sent by app.writer.client.call.
+"""
+
+from typing import Any, Callable, Dict
+
+from sqlmodel import Session
+
+from app.db.engine import engine
+
+COMMANDS: Dict[str, Callable[[Session, dict], Any]] = {}
+
+
+def command(name: str):
+    def register(func: Callable[[Session, dict], Any]):
+        COMMANDS[name] = func
+        return func
+    return register
+
+
+@command("chartink_alert")
+def chartink_alert(session: Session, args: dict) -> dict:
+    from app.routers.webhooks import process_chartink_alert
+    from app.schemas.chartink import ChartinkWebhookPayload
+
+    return process_chartink_alert(session, ChartinkWebhookPayload(**args))
+
+
+def execute(op: str, args: dict) -> Any:
+    func = COMMANDS.get(op)
+    if func is None:
+        raise ValueError(f"Unknown writer command: {op}")
+
+    with Session(engine) as session:
+        return func(session, args)
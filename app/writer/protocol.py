@@ -0,0 +1,50 @@
+"""
+Local IPC between API workers and the single writer process. Built on
+multiprocessing.connection (length-prefixed pickles, HMAC handshake via authkey).
+
+Requests:  {"op": <command name>, "args": {...}}   → {"ok": True, "result": ...}
+                                                   → {"ok": False, "error": "..."}
+Subscribe: {"op": "subscribe"}  then the writer pushes {"invalidate": (topic, ...)}
+Metrics:   {"op": "metrics"}    → {"ok": True, "result": {metric name: [sample line, ...]}}
+"""
+
+import os
+import sys
+import tempfile
+from typing import Tuple, Union
+
+Address = Union[str, Tuple[str, int]]
+
+SUBSCRIBE = "subscribe"
+PING = "ping"
+METRICS = "metrics"
+
+
+def parse_address(value: str) -> Address:
+    """`/path/to.sock` (AF_UNIX) or `host:port` (AF_INET)."""
+    if os.sep in value or value.endswith(".sock"):
+        return value
+    host, _, port = value.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def default_address() -> str:
+    if sys.platform == "win32":
+        return "127.0.0.1:8799"
+    return os.path.join(tempfile.gettempdir(), f"profitabull-writer-{os.getpid()}.sock")
+
+
+class WriterError(RuntimeError):
+    """A command failed inside the writer process."""
+
+
+def authkey() -> bytes:
+    """
+    The shared HMAC key. Messages are unpickled on receipt, so there is no
+    built-in default: anyone holding the key can run code in the writer.
+    """
+    from app.core.config import settings
+
+    if not settings.WRITER_AUTHKEY:
+        raise WriterError("WRITER_AUTHKEY must be set to use the writer process")
+    return settings.WRITER_AUTHKEY.encode()
@@ -0,0 +1,194 @@
+"""
+The single writer process. Every write from every API worker arrives here and is
+executed by ONE thread in arrival order, so SQLite never sees competing writers and
+the order of writes is deterministic. Also hosts the job scheduler when enabled.
+"""
+
+import asyncio
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Connection, Listener
+from typing import List
+
+from app.core import cache
+from app.core.config import settings
+from app.core.metrics import REGISTRY, process_label
+from app.writer.protocol import METRICS, PING, SUBSCRIBE, Address, authkey, parse_address
+
+# Invalidations buffered per subscriber before it is considered stuck.
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class _Subscriber:
+    """
+    One API worker's invalidation stream, sent from its own thread so a worker
+    that stops reading can't stall broadcast() (and with it the writer thread).
+    When its queue overflows it is dropped: the connection is closed, and the
+    client reconnects and invalidates ALL_TOPICS to cover what it missed.
+    """
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self.alive = True
+        self._queue: "queue.Queue[tuple | None]" = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        threading.Thread(target=self._send_forever, name="writer-subscriber", daemon=True).start()
+
+    def offer(self, topics: tuple) -> bool:
+        """Queue an event without blocking; False once this subscriber is gone."""
+        if not self.alive:
+            return False
+        try:
+            self._queue.put_nowait(topics)
+            return True
+        except queue.Full:
+            self._drop()
+            return False
+
+    def _drop(self) -> None:
+        # Only the sender thread touches the connection; make room for the
+        # sentinel so it closes it after whatever send is in progress.
+        self.alive = False
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put_nowait(None)
+
+    def _send_forever(self) -> None:
+        try:
+            while True:
+                topics = self._queue.get()
+                if topics is None:
+                    return
+                self.conn.send({"invalidate": topics})
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.alive = False
+            self.conn.close()
+
+
+class WriterServer:
+    def __init__(self, address: Address, authkey: bytes):
+        self.address = address
+        self.listener = Listener(address, authkey=authkey)
+        self._work: "queue.Queue[tuple[dict, Future] | None]" = queue.Queue()
+        self._subscribers: List[_Subscriber] = []
+        self._subscribers_lock = threading.Lock()
+
+    # --- single writer thread ---
+
+    def _execute_forever(self) -> None:
+        from app.writer.commands import execute
+
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            message, future = item
+            try:
+                future.set_result({"ok": True, "result": execute(message["op"], message["args"])})
+            except Exception as e:
+                future.set_result({"ok": False, "error": f"{type(e).__name__}: {e}"})
+
+    def submit(self, message: dict) -> dict:
+        future: Future = Future()
+        self._work.put((message, future))
+        return future.result()
+
+    # --- invalidation fan-out ---
+
+    def broadcast(self, topics: tuple) -> None:
+        with self._subscribers_lock:
+            self._subscribers = [s for s in self._subscribers if s.offer(topics)]
+
+    # --- connections ---
+
+    def _serve(self, conn: Connection) -> None:
+        try:
+            while True:
+                message = conn.recv()
+                op = message.get("op")
+
+                if op == SUBSCRIBE:
+                    with self._subscribers_lock:
+                        self._subscribers.append(_Subscriber(conn))
+                    return  # connection now belongs to its _Subscriber
+                if op == PING:
+                    conn.send({"ok": True, "result": "pong"})
+                    continue
+                if op == METRICS:
+                    # Answered here, not queued behind writes on the writer thread.
+                    conn.send({"ok": True, "result": REGISTRY.samples(process_label("writer"))})
+                    continue
+
+                conn.send(self.submit(message))
+        except (EOFError, OSError):
+            conn.close()
+
+    def serve_forever(self) -> None:
+        cache.add_broadcast_hook(self.broadcast)
+        threading.Thread(target=self._execute_forever, name="writer", daemon=True).start()
+
+        while True:
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError):
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+
+def _start_scheduler() -> None:
+    from app.jobs.jobs import default_jobs
+    from app.jobs.scheduler import Scheduler
+
+    scheduler = Scheduler(default_jobs(), tz=settings.SCHEDULER_TIMEZONE)
+    threading.Thread(
+        target=lambda: asyncio.run(scheduler.run_forever()),
+        name="scheduler",
+        daemon=True,
+    ).start()
+
+
+def run_writer(address: str) -> None:
+    """Entry point of the writer process."""
+    from app.db.init_db import init_db
+
+    init_db()
+
+    parsed = parse_address(address)
+    if isinstance(parsed, str) and os.path.exists(parsed):
+        os.unlink(parsed)  # stale socket from a previous run
+
+    server = WriterServer(parsed, authkey())
+
+    if settings.SCHEDULER_ENABLED:
+        _start_scheduler()
+
+    print(f"✍️ Writer listening on {address} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.listener.close()
+
+
+def wait_until_ready(address: str, timeout: float = 15.0) -> None:
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = Client(parse_address(address), authkey=authkey())
+            conn.send({"op": PING})
+            conn.recv()
+            conn.close()
+            return
+        except (OSError, EOFError):
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Writer did not come up on {address}")
+            time.sleep(0.05)
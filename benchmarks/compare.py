@@ -0,0 +1,65 @@
+"""
+Compare two benchmark result files produced by benchmarks/run.py.
+
+  uv run python -m benchmarks.compare base.json candidate.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Headline metric per benchmark and whether lower is better.
+HEADLINE = {
+    "webhook": ("p50_ms", True),
+    "dashboard": ("p50_ms", True),
+    "ingestion": ("total_ms", True),
+    "startup_import": ("import.p50_ms", True),
+    "startup_init_db": ("p50_ms", True),
+}
+
+
+def _metric(stats: dict, path: str):
+    value = stats
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _index(report: dict) -> Dict[Tuple[str, str], dict]:
+    return {
+        (r["name"], json.dumps(r["params"], sort_keys=True)): r["stats"]
+        for r in report["results"]
+    }
+
+
+def compare(base: dict, candidate: dict) -> list:
+    base_idx = _index(base)
+    rows = []
+    for key, stats in _index(candidate).items():
+        name, params = key
+        metric, lower_is_better = HEADLINE.get(name, ("mean_ms", True))
+        before = _metric(base_idx.get(key, {}), metric)
+        after = _metric(stats, metric)
+        if before is None or after is None:
+            continue
+        ratio = after / before if before else float("inf")
+        improved = ratio < 1 if lower_is_better else ratio > 1
+        rows.append((name, params, metric, before, after, ratio, improved))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs")
+    parser.add_argument("base", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+
+    base = json.loads(args.base.read_text())
+    candidate = json.loads(args.candidate.read_text())
+
+    for name, params, metric, before, after, ratio, improved in compare(base, candidate):
+        marker = "🟢" if improved else "🔴"
+        print(f"{marker} {name} {params} {metric}: {before:.2f} → {after:.2f} ({ratio:.2f}x)")
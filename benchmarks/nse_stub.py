@@ -0,0 +1,136 @@
+"""
+Local stand-in for www.nseindia.com. Serves the warm-up page and a GetQuoteApi
+response with the same JSON shape app.nse.nse.fetch_eod_data parses.
+Point the app at it with NSE_BASE_URL=http://127.0.0.1:<port>.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+API_PATH = "/api/NextApi/apiClient/GetQuoteApi"
+
+
+def quote_payload(symbol: str) -> dict:
+    """Deterministic per-symbol quote in the GetQuoteApi shape."""
+    rng = random.Random(symbol)
+    close = round(rng.uniform(50, 5000), 2)
+    traded = rng.randint(10_000, 5_000_000)
+    delivered = int(traded * rng.uniform(0.1, 0.9))
+    issued = rng.randint(10_000_000, 5_000_000_000)
+    # NSE reports market caps in ₹ crore
+    total_mcap = round(close * issued / 1e7, 2)
+    ffmc = round(total_mcap * rng.uniform(0.2, 0.9), 2)
+    return {
+        "equityResponse": [
+            {
+                "metaData": {
+                    "symbol": symbol,
+                    "closePrice": close,
+                    "pChange": round(rng.gauss(0, 1.5), 2),
+                },
+                "priceInfo": {
+                    "yearHigh": round(close * 1.3, 2),
+                    "yearLow": round(close * 0.7, 2),
+                },
+                "securityInfo": {
+                    "issuedSize": issued,
+                },
+                "tradeInfo": {
+                    "quantitytraded": traded,
+                    "deliveryquantity": delivered,
+                    "deliveryToTradedQuantity": round(delivered / traded * 100, 2),
+                    "totalMarketCap": total_mcap,
+                    "ffmc": ffmc,
+                },
+            }
+        ]
+    }
+
+
+class NSEStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, *, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def should_fail(self) -> bool:
+        with self.rng_lock:
+            self.requests += 1
+            return self.rng.random() < self.error_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: NSEStubServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        url = urlparse(self.path)
+
+        if url.path in ("", "/"):
+            self._send(200, b"<html>NSE stub</html>", "text/html")
+            return
+
+        if url.path != API_PATH:
+            self._send(404, b"{}", "application/json")
+            return
+
+        if self.server.should_fail():
+            self._send(503, b'{"error": "stub failure"}', "application/json")
+            return
+
+        symbol = parse_qs(url.query).get("symbol", [""])[0]
+        body = json.dumps(quote_payload(symbol)).encode()
+        self._send(200, body, "application/json")
+
+
+def start_stub(
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+) -> NSEStubServer:
+    """Start the stub on a background thread. Call `.shutdown()` when done."""
+    server = NSEStubServer((host, port), latency=latency, error_rate=error_rate, seed=seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local NSE GetQuoteApi stub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503s")
+    args = parser.parse_args()
+
+    server = NSEStubServer(("127.0.0.1", args.port), latency=args.latency, error_rate=args.error_rate)
+    print(f"🧪 NSE stub listening on {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,306 @@
+"""
+Benchmark suite. Runs against a throwaway SQLite file and the local NSE stub, and
+emits machine-readable JSON for comparison with benchmarks/compare.py.
+
+  uv run python -m benchmarks.run --output benchmarks/results/$(git rev-parse --short HEAD).json
+  uv run python -m benchmarks.run --quick --only webhook,dashboard
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.nse_stub import start_stub
+
+SUITES = ("webhook", "dashboard", "ingestion", "startup")
+
+# Modules a fresh process imports: API worker, and the two cron scripts.
+STARTUP_MODULES = (
+    "app.main",
+    "app.scripts.load_index_from_csv",
+    "app.scripts.nse_snapshot_ingestion",
+)
+
+_IMPORT_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+print(json.dumps({{"import_s": time.perf_counter() - t, "httpx_loaded": "httpx" in sys.modules}}))
+"""
+
+_INIT_DB_PROBE = """
+import json, time
+from app.db.init_db import init_db
+t = time.perf_counter()
+init_db()
+print(json.dumps({"init_db_s": time.perf_counter() - t}))
+"""
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pct(0.50) * 1000,
+        "p95_ms": pct(0.95) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 1) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def reset_db(engine) -> None:
+    from sqlmodel import SQLModel
+
+    import app.models  # noqa: F401 — register tables
+
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+
+def bench_webhook(engine, sizes: List[int], iterations: int) -> List[dict]:
+    from sqlmodel import Session
+
+    from app.routers.webhooks import process_chartink_alert
+    from app.schemas.chartink import ChartinkWebhookPayload
+    from benchmarks.synthetic import MarketSpec, chartink_payload, generate_market
+
+    results = []
+    for size in sizes:
+        reset_db(engine)
+        with Session(engine) as session:
+            market = generate_market(session, MarketSpec(n_symbols=max(sizes), n_screeners=5))
+
+        rng = random.Random(size)
+
+        def one_alert():
+            payload = chartink_payload(
+                rng.sample(market.symbols, size), rng.choice(market.screener_slugs), rng
+            )
+            with Session(engine) as session:
+                process_chartink_alert(session, ChartinkWebhookPayload(**payload))
+
+        samples = measure(one_alert, iterations)
+        stats = summarize(samples)
+        total = sum(samples)
+        stats["alerts_per_s"] = len(samples) / total
+        stats["symbols_per_s"] = len(samples) * size / total
+        results.append({"name": "webhook", "params": {"alert_size": size}, "stats": stats})
+        print(f"  webhook alert_size={size}: p50={stats['p50_ms']:.2f}ms {stats['symbols_per_s']:.0f} symbols/s")
+    return results
+
+
+def bench_dashboard(engine, index_sizes: List[int], day_counts: List[int], iterations: int) -> List[dict]:
+    from sqlmodel import Session
+
+    from app.routers.dashboard import dashboard_view
+    from benchmarks.synthetic import MarketSpec, generate_market
+
+    results = []
+    for n_days in day_counts:
+        for n_symbols in index_sizes:
+            reset_db(engine)
+            spec = MarketSpec(n_symbols=n_symbols, n_screeners=10, n_days=n_days)
+            with Session(engine) as session:
+                market = generate_market(session, spec)
+            trade_date = market.trade_dates[-1]
+
+            def one_view():
+                with Session(engine) as session:
+                    dashboard_view(index=spec.index_name, trade_date=trade_date, session=session)
+
+            stats = summarize(measure(one_view, iterations))
+            results.append(
+                {
+                    "name": "dashboard",
+                    "params": {"index_size": n_symbols, "days": n_days},
+                    "stats": stats,
+                }
+            )
+            print(f"  dashboard index_size={n_symbols} days={n_days}: p50={stats['p50_ms']:.2f}ms")
+    return results
+
+
+def bench_ingestion(engine, stub, symbol_counts: List[int], latency: float, error_rate: float) -> List[dict]:
+    from sqlmodel import Session
+
+    from app.scripts.nse_snapshot_ingestion import ingest_nse_eod_snapshots
+    from benchmarks.synthetic import MarketSpec, generate_market
+
+    stub.latency = latency
+    stub.error_rate = error_rate
+
+    results = []
+    for n_symbols in symbol_counts:
+        reset_db(engine)
+        with Session(engine) as session:
+            market = generate_market(session, MarketSpec(n_symbols=n_symbols, n_days=0))
+
+        start = time.perf_counter()
+        asyncio.run(ingest_nse_eod_snapshots(trade_date=market.spec.end_date))
+        elapsed = time.perf_counter() - start
+
+        stats = {
+            "total_ms": elapsed * 1000,
+            "symbols_per_s": n_symbols / elapsed,
+            "stub_latency_ms": latency * 1000,
+            "stub_error_rate": error_rate,
+        }
+        results.append({"name": "ingestion", "params": {"symbols": n_symbols}, "stats": stats})
+        print(f"  ingestion symbols={n_symbols}: {elapsed:.2f}s ({stats['symbols_per_s']:.0f} symbols/s)")
+    return results
+
+
+def _probe(code: str, db_url: str) -> tuple[dict, float]:
+    """Run `code` in a fresh interpreter; returns (its JSON output, process wall time)."""
+    env = {**os.environ, "DATABASE_URL": db_url}
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    wall = time.perf_counter() - start
+    return json.loads(out.strip().splitlines()[-1]), wall
+
+
+def bench_startup(tmpdir: str, repeats: int) -> List[dict]:
+    results = []
+
+    for module in STARTUP_MODULES:
+        imports, walls, httpx_loaded = [], [], False
+        for _ in range(repeats):
+            out, wall = _probe(_IMPORT_PROBE.format(module=module), f"sqlite:///{tmpdir}/startup.db")
+            imports.append(out["import_s"])
+            walls.append(wall)
+            httpx_loaded = out["httpx_loaded"]
+        stats = {
+            "import": summarize(imports),
+            "process": summarize(walls),
+            "httpx_loaded": httpx_loaded,
+        }
+        results.append({"name": "startup_import", "params": {"module": module}, "stats": stats})
+        print(f"  import {module}: p50={stats['import']['p50_ms']:.0f}ms (process {stats['process']['p50_ms']:.0f}ms)")
+
+    cold, warm = [], []
+    for i in range(repeats):
+        db_url = f"sqlite:///{tmpdir}/init-{i}.db"
+        cold.append(_probe(_INIT_DB_PROBE, db_url)[0]["init_db_s"])
+        warm.append(_probe(_INIT_DB_PROBE, db_url)[0]["init_db_s"])
+    for state, samples in (("cold", cold), ("warm", warm)):
+        stats = summarize(samples)
+        results.append({"name": "startup_init_db", "params": {"schema": state}, "stats": stats})
+        print(f"  init_db {state}: p50={stats['p50_ms']:.2f}ms")
+
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main(argv: List[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Run Profitabull benchmarks")
+    parser.add_argument("--only", default=",".join(SUITES), help=f"Comma-separated subset of {SUITES}")
+    parser.add_argument("--quick", action="store_true", help="Small sizes for a fast smoke run")
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--stub-latency", type=float, default=0.002, help="NSE stub seconds per request")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here")
+    args = parser.parse_args(argv)
+
+    suites = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suites: {sorted(unknown)}")
+
+    iterations = args.iterations or (5 if args.quick else 30)
+
+    # The app binds its engine and NSE base URL at import time, so both must be
+    # configured before anything under app.* is imported.
+    tmpdir = tempfile.TemporaryDirectory(prefix="profitabull-bench-")
+    stub = start_stub()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir.name}/bench.db"
+    os.environ["NSE_BASE_URL"] = stub.base_url
+
+    from app.db.engine import engine
+
+    results: List[dict] = []
+    try:
+        if "webhook" in suites:
+            print("📈 webhook")
+            sizes = [1, 10] if args.quick else [1, 10, 50, 250]
+            results += bench_webhook(engine, sizes, iterations)
+
+        if "dashboard" in suites:
+            print("📈 dashboard")
+            index_sizes = [50] if args.quick else [50, 200, 500]
+            day_counts = [1, 5] if args.quick else [1, 20, 250]
+            results += bench_dashboard(engine, index_sizes, day_counts, iterations)
+
+        if "ingestion" in suites:
+            print("📈 ingestion")
+            counts = [20] if args.quick else [50, 200]
+            results += bench_ingestion(engine, stub, counts, args.stub_latency, args.stub_error_rate)
+
+        if "startup" in suites:
+            print("📈 startup")
+            results += bench_startup(tmpdir.name, 3 if args.quick else 10)
+    finally:
+        stub.shutdown()
+        engine.dispose()
+        tmpdir.cleanup()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"✅ Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Deterministic synthetic market data for benchmarks. Same seed -> same rows."""
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import insert, select
+from sqlmodel import Session
+
+from app.models.daily_screener_status import DailyScreenerStatus
+from app.models.daily_symbol_snapshot import DailySymbolSnapshot
+from app.models.index import Index
+from app.models.index_constituent import IndexConstituent
+from app.models.screener import Screener
+from app.models.symbol import Symbol
+
+
+@dataclass
+class MarketSpec:
+    n_symbols: int = 50
+    n_screeners: int = 5
+    n_days: int = 1
+    index_name: str = "BENCH"
+    hit_rate: float = 0.1
+    seed: int = 42
+    end_date: date = date(2025, 1, 31)
+
+
+@dataclass
+class SyntheticMarket:
+    spec: MarketSpec
+    symbols: List[str]
+    screener_slugs: List[str]
+    trade_dates: List[date]
+
+
+def symbol_name(i: int) -> str:
+    return f"SYM{i:05d}"
+
+
+def trading_days(end: date, n: int) -> List[date]:
+    """The last `n` weekdays up to and including `end`, oldest first."""
+    days: List[date] = []
+    d = end
+    while len(days) < n:
+        if d.weekday() < 5:
+            days.append(d)
+        d -= timedelta(days=1)
+    return sorted(days)
+
+
+def generate_market(session: Session, spec: MarketSpec) -> SyntheticMarket:
+    """
+    Insert N symbols (all members of one index), M screeners and D trading
+    days of snapshots and screener statuses. Uses bulk INSERTs and a single
+    commit so large datasets load quickly.
+    """
+    rng = random.Random(spec.seed)
+    now = datetime.now(timezone.utc)
+
+    symbols = [symbol_name(i) for i in range(spec.n_symbols)]
+    slugs = [f"bench-screener-{i}" for i in range(spec.n_screeners)]
+    days = trading_days(spec.end_date, spec.n_days)
+
+    session.execute(
+        insert(Symbol),
+        [{"symbol": s, "name": f"{s} Ltd.", "exchange": "NSE"} for s in symbols],
+    )
+    session.execute(
+        insert(Screener),
+        [
+            {"name": f"Screener {i}", "slug": slug, "source": "chartink", "active": True, "created_at": now}
+            for i, slug in enumerate(slugs)
+        ],
+    )
+    session.execute(insert(Index), [{"name": spec.index_name, "description": "Synthetic"}])
+    session.flush()
+
+    symbol_ids = dict(session.execute(select(Symbol.symbol, Symbol.id)).all())
+    screener_ids = list(session.execute(select(Screener.id)).scalars())
+    index_id = session.execute(
+        select(Index.id).where(Index.name == spec.index_name)
+    ).scalar_one()
+
+    session.execute(
+        insert(IndexConstituent),
+        [
+            {"index_id": index_id, "symbol_id": symbol_ids[s], "weightage": None}
+            for s in symbols
+        ],
+    )
+
+    snapshots = []
+    statuses = []
+    for s in symbols:
+        sid = symbol_ids[s]
+        price = rng.uniform(50, 5000)
+        for d in days:
+            change = rng.gauss(0, 1.5)
+            price = max(1.0, price * (1 + change / 100))
+            volume = int(rng.lognormvariate(13, 1))
+            delivery_pct = round(rng.uniform(10, 90), 2)
+            snapshots.append(
+                {
+                    "symbol_id": sid,
+                    "trade_date": d,
+                    "close_price": round(price, 2),
+                    "change_pct": round(change, 2),
+                    "volume": volume,
+                    "extra_data": {
+                        "year_high": round(price * 1.3, 2),
+                        "year_low": round(price * 0.7, 2),
+                        "delivery_volume": int(volume * delivery_pct / 100),
+                        "delivery_pct": delivery_pct,
+                    },
+                    "created_at": now,
+                }
+            )
+            for scr_id in screener_ids:
+                if rng.random() < spec.hit_rate:
+                    ts = datetime.combine(d, datetime.min.time(), tzinfo=timezone.utc)
+                    statuses.append(
+                        {
+                            "symbol_id": sid,
+                            "screener_id": scr_id,
+                            "trade_date": d,
+                            "triggered": True,
+                            "trigger_count": rng.randint(1, 4),
+                            "first_triggered_at": ts,
+                            "last_triggered_at": ts,
+                        }
+                    )
+
+    if snapshots:
+        session.execute(insert(DailySymbolSnapshot), snapshots)
+    if statuses:
+        session.execute(insert(DailyScreenerStatus), statuses)
+
+    session.commit()
+
+    return SyntheticMarket(spec=spec, symbols=symbols, screener_slugs=slugs, trade_dates=days)
+
+
+def chartink_payload(symbols: List[str], slug: str, rng: random.Random) -> dict:
+    """A ChartinkWebhookPayload-shaped dict for the given symbols."""
+    return {
+        "stocks": ",".join(symbols),
+        "trigger_prices": ",".join(f"{rng.uniform(50, 5000):.2f}" for _ in symbols),
+        "triggered_at": "10:15 am",
+        "scan_name": slug.replace("-", " ").title(),
+        "scan_url": slug,
+        "alert_name": f"Alert for {slug}",
+        "webhook_url": "http://localhost/webhooks/chartink",
+    }